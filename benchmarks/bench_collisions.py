@@ -0,0 +1,67 @@
+"""
+Per-tick cost of the multiplayer rules for different snake lengths and snake counts.
+
+Snakes of the given length run side by side on a wrapping board that is wider
+than the snakes, so they never collide and every measured tick does the full
+work: turn, move, collision pass and head placement.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_collisions
+"""
+import time
+from typing import List
+
+from src.engine import EMPTY, GameState, Snake, step, _resolve_collisions
+
+LENGTHS = (10, 1000, 6000)
+SNAKE_COUNTS = (2, 4, 8, 16)
+TICKS = 20000
+
+
+def make_state(length: int, count: int = 2) -> GameState:
+    width = length + 100
+    snakes: List[Snake] = [
+        Snake([row * width + length - 1 - i for i in range(length)]) for row in range(0, 2 * count, 2)
+    ]
+    return GameState(width, 2 * count, snakes, wrap=True, num_food=0)
+
+
+def time_per_tick(length: int, count: int = 2, ticks: int = TICKS) -> float:
+    """Average seconds for a full step() of ``count`` snakes with ``length`` segments."""
+    state = make_state(length, count)
+    actions = [None] * count
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(state, actions)
+    elapsed = time.perf_counter() - start
+    assert not state.game_over
+    return elapsed / ticks
+
+
+def time_collision_pass(length: int, count: int = 2, ticks: int = TICKS) -> float:
+    """Average seconds for the collision pass alone."""
+    state = make_state(length, count)
+    # Same situation as inside step(): the new heads are not in the grid yet
+    for snake in state.snakes:
+        state.set_cell(snake.head, EMPTY)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        _resolve_collisions(state)
+    elapsed = time.perf_counter() - start
+    assert all(snake.alive for snake in state.snakes)
+    return elapsed / ticks
+
+
+def main() -> None:
+    print(f"{'length':>8} {'step µs':>10} {'collisions µs':>15}")
+    for length in LENGTHS:
+        print(f"{length:>8} {time_per_tick(length) * 1e6:>10.2f} {time_collision_pass(length) * 1e6:>15.2f}")
+    print()
+    print(f"{'snakes':>8} {'step µs':>10} {'collisions µs':>15}")
+    for count in SNAKE_COUNTS:
+        print(f"{count:>8} {time_per_tick(100, count) * 1e6:>10.2f} {time_collision_pass(100, count) * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Input-to-screen delay of networked play with and without client-side prediction.
+
+A game server and a TCP proxy run in a background thread. The proxy delays every
+chunk in both directions by the one-way latency plus a random jitter (in order, like
+TCP would). A headless client connected through the proxy plays against a server bot,
+turns at random moments and measures how long it takes until the turn shows up in the
+state it would draw. With prediction it also counts the corrections, i.e. server
+updates that moved the already drawn own snake.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_latency --latency 50 --jitter 20
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List
+
+from src.client import NetClient
+from src.server import GameServer
+
+HOST = "127.0.0.1"
+SERVER_PORT = 8811
+PROXY_PORT = 8812
+POLL_INTERVAL = 1 / 240  # a render loop a little faster than a 144 Hz screen
+TURN_INTERVAL = (0.2, 0.5)
+PERPENDICULAR = {"UP": ("LEFT", "RIGHT"), "DOWN": ("LEFT", "RIGHT"), "LEFT": ("UP", "DOWN"), "RIGHT": ("UP", "DOWN")}
+
+
+class LatencyProxy:
+    """Forwards TCP connections to ``target_port``, delaying each chunk by latency +- jitter."""
+
+    def __init__(self, target_port: int, latency: float, jitter: float, seed: int = 0):
+        self.target_port = target_port
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    async def handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        server_reader, server_writer = await asyncio.open_connection(HOST, self.target_port)
+        await asyncio.gather(self._pump(client_reader, server_writer), self._pump(server_reader, client_writer))
+
+    async def _pump(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        async def deliver() -> None:
+            while True:
+                due, data = await chunks.get()
+                await asyncio.sleep(max(due - loop.time(), 0))
+                if data is None:
+                    writer.close()
+                    return
+                writer.write(data)
+
+        delivery = asyncio.create_task(deliver())
+        last_due = 0.0
+        while True:
+            try:
+                data = await reader.read(65536)
+            except ConnectionError:
+                data = b""
+            # never before the previous chunk: the stream keeps its order
+            last_due = max(loop.time() + self.latency + self.rng.uniform(-self.jitter, self.jitter), last_due)
+            chunks.put_nowait((last_due, data or None))
+            if not data:
+                break
+        await delivery
+
+
+def start_network(latency: float, jitter: float, tick_rate: int) -> None:
+    async def run() -> None:
+        server = GameServer(players=2, bots=1, tick_rate=tick_rate)
+        await server.start(HOST, SERVER_PORT)
+        proxy = LatencyProxy(SERVER_PORT, latency, jitter)
+        await asyncio.start_server(proxy.handle, HOST, PROXY_PORT)
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(run()), daemon=True).start()
+    time.sleep(0.3)
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def measure(predict: bool, turns: int, rng: random.Random) -> Dict[str, float]:
+    """Plays through the proxy until ``turns`` turns were seen on screen."""
+    delays: List[float] = []
+    corrections = 0
+    played = 0.0
+    games = 0
+    leads: List[int] = []
+    while len(delays) < turns:
+        games += 1
+        client = NetClient(HOST, PROXY_PORT, f"{'predict' if predict else 'plain'}-{games}", "bench", predict=predict)
+        start = time.perf_counter()
+        next_turn = start + rng.uniform(*TURN_INTERVAL)
+        wanted = None
+        pressed = 0.0
+        while not client.game_over and client.connected and len(delays) < turns:
+            client.poll()
+            now = time.perf_counter()
+            if client.state is not None:
+                snake = client.state.snakes[client.snake_index]
+                if wanted is not None and snake.direction == wanted:
+                    delays.append(now - pressed)
+                    wanted = None
+                    next_turn = now + rng.uniform(*TURN_INTERVAL)
+                elif wanted is None and now >= next_turn and snake.alive:
+                    wanted = rng.choice(PERPENDICULAR[snake.direction])
+                    pressed = now
+                    client.send_input(wanted)
+                    if client.prediction is not None:
+                        leads.append(client.prediction.lead)
+            time.sleep(POLL_INTERVAL)
+        played += time.perf_counter() - start
+        if client.prediction is not None:
+            corrections += client.prediction.corrections
+        client.close()
+    return {
+        "p50": percentile(delays, 0.5) * 1000,
+        "p99": percentile(delays, 0.99) * 1000,
+        "corrections/s": corrections / played,
+        "lead": sum(leads) / len(leads) if leads else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=50, help="one-way latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="+- ms added to every chunk")
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--tick-rate", type=int, default=30)
+    args = parser.parse_args()
+    start_network(args.latency / 1000, args.jitter / 1000, args.tick_rate)
+    print(f"one-way latency {args.latency:.0f} ms +- {args.jitter:.0f} ms, {args.tick_rate} ticks/s")
+    print(f"{'client':>12} {'p50 ms':>8} {'p99 ms':>8} {'corr/s':>8} {'lead':>6}")
+    for predict in (False, True):
+        result = measure(predict, args.turns, random.Random(1))
+        print(f"{'predicted' if predict else 'server only':>12} {result['p50']:8.1f} {result['p99']:8.1f} "
+              f"{result['corrections/s']:8.2f} {result['lead']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
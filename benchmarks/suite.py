@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the hot paths, with a saved baseline to catch regressions.
+
+Drives the real pygame front ends headlessly (SDL dummy video driver):
+
+* ``single.tick`` / ``single.frame``: one ``SingleplayerLogic.update()`` and one
+  incremental ``draw_elements()`` with a snake of the given length. The snake is
+  steered along a Hamiltonian cycle of the board, so these scripted games never end.
+* ``single.full_redraw``: a complete repaint of the board.
+* ``multi.tick`` / ``multi.frame``: the same for ``MultiplayerLogic`` (two snakes).
+* ``spawn_food``: one food spawn at the given board occupancy in percent. The free-cell
+  index behind it takes 8 bytes per board cell (two ``array('i')``), checked before timing.
+* ``collisions``: the multiplayer collision pass (see ``bench_collisions``).
+* ``db.*``: ``SQLiteScore`` in memory: one row of a 50-row ``insert_scores`` batch,
+  ``get_leaderboard`` and ``get_rank`` on 20000 games.
+
+Every result is seconds per operation (lower is better), the best of ``--repeat`` runs.
+Run from the repository root:
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+
+With ``--compare`` the exit code is 1 if a benchmark got slower than the baseline by
+more than ``--tolerance`` (default 25 %).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame  # noqa: E402
+
+from benchmarks.bench_collisions import time_collision_pass  # noqa: E402
+from src.bots import Controller  # noqa: E402
+from src.engine import DIRECTIONS, EMPTY, GameState, spawn_food  # noqa: E402
+from src.logic import BaseLogic  # noqa: E402
+from src.multiplayer import MultiplayerLogic  # noqa: E402
+from src.singleplayer import SingleplayerLogic  # noqa: E402
+from src.sqlite_score import SQLiteScore  # noqa: E402
+
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 850
+LENGTHS = (10, 1000, 5000)
+OCCUPANCIES = (0, 50, 90, 99)
+COLLISION_LENGTHS = (10, 1000)
+DB_ROWS = 20000
+DB_BATCH = 50
+TICKS = 2000
+
+
+def hamiltonian_cycle(width: int, height: int) -> List[int]:
+    """
+    A closed path through every cell of a board with an even height: rows are walked
+    in alternating directions over columns 1..width-1, column 0 leads back up.
+    """
+    cycle = []
+    for y in range(height):
+        columns = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend(y * width + x for x in columns)
+    cycle.extend(y * width for y in range(height - 1, -1, -1))
+    return cycle
+
+
+def cycle_controller(state: GameState) -> Controller:
+    """Steers any snake along :func:`hamiltonian_cycle`, so it never crashes until the board is full."""
+    cycle = hamiltonian_cycle(state.width, state.height)
+    following = {cell: cycle[(i + 1) % len(cycle)] for i, cell in enumerate(cycle)}
+    moves = {(dx + dy * state.width) % len(state.grid): name for name, (dx, dy) in DIRECTIONS.items()}
+
+    def controller(state: GameState, snake_index: int) -> str:
+        head = state.snakes[snake_index].head
+        return moves[(following[head] - head) % len(state.grid)]
+    return controller
+
+
+def set_body(state: GameState, snake_index: int, cells: List[int]) -> None:
+    """Replaces a snake's body (head first) and respawns food that was in the way."""
+    snake = state.snakes[snake_index]
+    for slot, food in enumerate(state.food):
+        if food is not None:
+            state.set_cell(food, EMPTY)
+            state.food[slot] = None
+    for cell in snake.body:
+        state.set_cell(cell, EMPTY)
+    snake.body.clear()
+    for cell in reversed(cells):
+        snake.body.push_head(cell)
+        state.set_cell(cell, snake_index + 1)
+    spawn_food(state)
+
+
+def singleplayer_game(window: pygame.Surface, length: int) -> BaseLogic:
+    """A singleplayer game on the cycle whose snake already has ``length`` segments."""
+    game = SingleplayerLogic(window, pygame.time.Clock(), WINDOW_WIDTH, WINDOW_HEIGHT)
+    state = game.state
+    cycle = hamiltonian_cycle(state.width, state.height)
+    position = cycle.index(state.snakes[0].head)
+    set_body(state, 0, [cycle[(position - k) % len(cycle)] for k in range(length)])
+    game.controllers = [cycle_controller(state)]
+    return game
+
+
+def best_of(repeat: int, run: Callable[[], float]) -> float:
+    return min(run() for _ in range(repeat))
+
+
+def time_ticks(game: BaseLogic, draw: bool, ticks: int = TICKS) -> float:
+    game.draw_elements()  # the first frame is a full redraw
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+        if draw:
+            game.draw_elements()
+    elapsed = time.perf_counter() - start
+    assert not game.state.game_over
+    return elapsed / ticks
+
+
+def time_full_redraw(game: BaseLogic, frames: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.full_redraw = True
+        game.draw_elements()
+    return (time.perf_counter() - start) / frames
+
+
+def time_spawn(occupancy: int, spawns: int = 20000) -> float:
+    """Seconds per food spawn on a 100x100 board with ``occupancy`` percent of the cells taken."""
+    state = GameState(100, 100, [], num_food=1, seed=1)
+    cells = list(range(len(state.grid)))
+    random.Random(1).shuffle(cells)
+    state.set_cell(state.food[0], EMPTY)
+    state.food[0] = None
+    for cell in cells[:len(cells) * occupancy // 100]:
+        state.set_cell(cell, 1)
+    free = state.free
+    assert free.cells.itemsize * len(free.cells) + free.slots.itemsize * len(free.slots) <= 8 * len(state.grid)
+    start = time.perf_counter()
+    for _ in range(spawns):
+        spawn_food(state)
+        state.set_cell(state.food[0], EMPTY)
+        state.food[0] = None
+    return (time.perf_counter() - start) / spawns
+
+
+def db_rows() -> List[tuple]:
+    rng = random.Random(1)
+    now = datetime(2025, 1, 1)
+    return [(f"player{rng.randrange(2000)}", rng.randrange(1, 500), now + timedelta(seconds=i)) for i in range(DB_ROWS)]
+
+
+def time_db_insert(rows: List[tuple]) -> float:
+    """Seconds per row when inserting in batches of DB_BATCH, like the ScoreWriter does."""
+    store = SQLiteScore(":memory:")
+    start = time.perf_counter()
+    for i in range(0, len(rows), DB_BATCH):
+        assert store.insert_scores(rows[i:i + DB_BATCH])
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / len(rows)
+
+
+def time_query(query: Callable[[], object], calls: int = 1000) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        query()
+    return (time.perf_counter() - start) / calls
+
+
+def run_suite(repeat: int, only: str = "") -> Dict[str, float]:
+    pygame.init()
+    window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    results: Dict[str, float] = {}
+
+    def record(name: str, run: Callable[[], float]) -> None:
+        if only in name:
+            results[name] = best_of(repeat, run)
+
+    for length in LENGTHS:
+        record(f"single.tick.len{length}", lambda: time_ticks(singleplayer_game(window, length), draw=False))
+        record(f"single.frame.len{length}", lambda: time_ticks(singleplayer_game(window, length), draw=True))
+        record(f"single.full_redraw.len{length}", lambda: time_full_redraw(singleplayer_game(window, length)))
+
+    def multiplayer() -> BaseLogic:
+        # without input both snakes run straight on the wrapping board forever
+        return MultiplayerLogic(window, pygame.time.Clock(), WINDOW_WIDTH, WINDOW_HEIGHT, ["A", "B"])
+    record("multi.tick", lambda: time_ticks(multiplayer(), draw=False))
+    record("multi.frame", lambda: time_ticks(multiplayer(), draw=True))
+    for occupancy in OCCUPANCIES:
+        record(f"spawn_food.occ{occupancy}", lambda: time_spawn(occupancy))
+    for length in COLLISION_LENGTHS:
+        record(f"collisions.len{length}", lambda: time_collision_pass(length))
+
+    rows = db_rows()
+    store = SQLiteScore(":memory:")
+    store.insert_scores(rows)
+    record("db.insert_scores.row", lambda: time_db_insert(rows))
+    record("db.get_leaderboard", lambda: time_query(lambda: store.get_leaderboard(10)))
+    record("db.get_rank", lambda: time_query(lambda: store.get_rank(250)))
+    store.close()
+    pygame.quit()
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Prints every result next to the baseline and returns the names of the regressions."""
+    regressions = []
+    print(f"{'benchmark':<28} {'µs':>10} {'baseline':>10} {'change':>8}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<28} {value * 1e6:>10.2f} {'-':>10}")
+            continue
+        change = value / base - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {value * 1e6:>10.2f} {base * 1e6:>10.2f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks of the simulation, rendering and score store")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest counts")
+    parser.add_argument("--only", default="", help="run only benchmarks whose name contains this")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON, e.g. as the new baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    results = run_suite(args.repeat, args.only)
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+    else:
+        compare(results, {}, args.tolerance)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, file, indent=2)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
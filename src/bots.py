@@ -0,0 +1,239 @@
+"""
+Computer-controlled snakes.
+
+A controller is a plain function ``controller(state, snake_index)`` that returns the
+direction the snake should take on the next tick, or None to keep going straight.
+It gets the same :class:`src.engine.GameState` a human player sees and its result is
+passed to :func:`src.engine.step` like a key press.
+
+Controllers are referenced by import path (``"src.bots:greedy_bot"``), which keeps them
+picklable for the tournament runner and lets new bots live in any module. Bots that keep
+buffers between calls are classes with ``__call__``; a module-level instance serves as
+the controller.
+"""
+import importlib
+import random
+from array import array
+from typing import Callable, Container, Iterator, Optional, Sequence, Tuple
+
+from src.engine import DIRECTIONS, EMPTY, FOOD, OPPOSITE, GameState
+
+Controller = Callable[[GameState, int], Optional[str]]
+
+MAX_VISITED = 6400  # cells per pathfinding search, the whole default board
+FOOD_RADIUS = int((MAX_VISITED / 2) ** 0.5)  # how far such a search gets on an open board
+MAX_SEARCH_ID = 2 ** 31 - 1
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+DIRECTION_NAMES = list(DIRECTIONS) + [None]  # index -1 marks the search from the tail
+
+
+def load_controller(path: str) -> Controller:
+    """Imports a controller from ``"package.module:function"``."""
+    module_name, sep, name = path.partition(":")
+    if not sep:
+        raise ValueError(f"Controller path must look like 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def neighbor(state: GameState, cell: int, direction: str) -> Optional[int]:
+    """Packed cell next to ``cell``, or None if it lies outside a board without wrapping."""
+    dx, dy = DIRECTIONS[direction]
+    y, x = divmod(cell, state.width)
+    x += dx
+    y += dy
+    if state.wrap:
+        x %= state.width
+        y %= state.height
+    elif not (0 <= x < state.width and 0 <= y < state.height):
+        return None
+    return y * state.width + x
+
+
+def distance(state: GameState, a: int, b: int) -> int:
+    """Manhattan distance between two cells, taking the short way around on wrapping boards."""
+    ay, ax = divmod(a, state.width)
+    by, bx = divmod(b, state.width)
+    dx, dy = abs(ax - bx), abs(ay - by)
+    if state.wrap:
+        dx = min(dx, state.width - dx)
+        dy = min(dy, state.height - dy)
+    return dx + dy
+
+
+def safe_directions(state: GameState, snake_index: int) -> Iterator[Tuple[str, int]]:
+    """Directions that do not run into a wall or an occupied cell on the next tick."""
+    snake = state.snakes[snake_index]
+    for direction in DIRECTIONS:
+        if direction == OPPOSITE[snake.direction]:
+            continue
+        cell = neighbor(state, snake.head, direction)
+        if cell is not None and (state.grid[cell] == EMPTY or state.grid[cell] == FOOD):
+            yield direction, cell
+
+
+def random_bot(state: GameState, snake_index: int) -> Optional[str]:
+    """Picks a random direction that survives the next tick."""
+    options = [direction for direction, _ in safe_directions(state, snake_index)]
+    return random.choice(options) if options else None
+
+
+def greedy_bot(state: GameState, snake_index: int) -> Optional[str]:
+    """Takes the safe step that gets closest to the nearest food item."""
+    food = [cell for cell in state.food if cell is not None]
+    best, best_distance = None, None
+    for direction, cell in safe_directions(state, snake_index):
+        d = min((distance(state, cell, item) for item in food), default=0)
+        if best_distance is None or d < best_distance:
+            best, best_distance = direction, d
+    return best
+
+
+class PathfindingBot:
+    """
+    Follows a shortest path to the nearest food item and avoids trapping itself.
+
+    Each decision runs a breadth-first search from the cells next to the head to the
+    nearest food (all steps cost the same, so BFS finds the same paths as A* without a
+    heuristic and handles several food items at once), and one search outwards from the
+    tail. The first step towards the food is only taken if the tail can still be reached
+    from there; otherwise the bot takes the step with the longest way back to its tail,
+    or, if none is left, the one with the most room.
+
+    Every search stops after MAX_VISITED cells, so a decision costs the same on any board
+    size. Food further away than that (or than FOOD_RADIUS, which is not searched at
+    all) is approached greedily, and a step counts as safe without reaching the tail if
+    it leads into at least MAX_VISITED free cells.
+
+    The neighbor tables (one flat ``array`` per direction, wrap-aware, -1 off the board)
+    and the search buffers are built once per board size and reused for every tick.
+    Visited cells are marked with the number of the current search instead of a flag,
+    so the buffers never have to be cleared.
+    """
+
+    def __init__(self):
+        self._board: Optional[Tuple[int, int, bool]] = None
+        self._tables: Tuple[array, ...] = ()
+        self._seen = array("i")
+        self._distance = array("i")
+        self._first = array("b")
+        self._queue = array("i")
+        self._search_id = 0
+
+    def __call__(self, state: GameState, snake_index: int) -> Optional[str]:
+        self._prepare(state)
+        snake = state.snakes[snake_index]
+        head, tail = snake.head, snake.body.tail
+        grid = state.grid
+        candidates = [(direction, cell) for direction, table in zip(DIRECTIONS, self._tables)
+                      if direction != OPPOSITE[snake.direction] and (cell := table[head]) >= 0
+                      and (grid[cell] == EMPTY or grid[cell] == FOOD or cell == tail)]
+        # Next to the head of an equal or longer snake we could lose a head-on collision
+        danger = {table[other.head] for i, other in enumerate(state.snakes)
+                  if i != snake_index and other.alive and len(other) >= len(snake)
+                  for table in self._tables}
+        candidates = [move for move in candidates if move[1] not in danger] or candidates
+        if not candidates:
+            return None
+
+        food = [cell for cell in state.food if cell is not None]
+        if len(grid) <= MAX_VISITED or any(distance(state, head, item) <= FOOD_RADIUS for item in food):
+            food_direction, visited = self._search(state, candidates, head, tail, None)
+        else:
+            food_direction, visited = None, MAX_VISITED
+        if food_direction is None and visited >= MAX_VISITED and food:  # too far away for the search
+            food_direction = min(candidates, key=lambda move: min(distance(state, move[1], item) for item in food))[0]
+        targets = {cell for _, cell in candidates}
+        _, visited = self._search(state, [(None, tail)], head, tail, targets, len(targets))
+        tail_search = self._search_id
+        to_tail = [(self._distance[cell], direction) for direction, cell in candidates
+                   if self._seen[cell] == tail_search]
+        if visited >= MAX_VISITED:
+            # the search gave up before reaching every step: enough room counts as safe, too
+            unreached = [move for move in candidates if self._seen[move[1]] != tail_search]
+            to_tail += [(MAX_VISITED, move[0]) for move in unreached
+                        if self._search(state, [move], head, tail, ())[1] >= MAX_VISITED]
+        if food_direction is not None and any(direction == food_direction for _, direction in to_tail):
+            return food_direction
+        if to_tail:
+            return max(to_tail)[1]
+
+        if len(candidates) == 1:
+            return candidates[0][0]
+        room = [(self._search(state, [move], head, tail, ())[1], move[0]) for move in candidates]
+        return max(room)[1]
+
+    def _prepare(self, state: GameState) -> None:
+        """(Re)builds the neighbor tables and the search buffers when the board changes."""
+        board = (state.width, state.height, state.wrap)
+        if board == self._board:
+            return
+        width, height, wrap = board
+        size = width * height
+        up = array("i", range(-width, size - width))
+        down = array("i", range(width, size + width))
+        left = array("i", range(-1, size - 1))
+        right = array("i", range(1, size + 1))
+        # the first and last row and column lead around the board or off it
+        up[:width] = array("i", range(size - width, size)) if wrap else array("i", [-1]) * width
+        down[size - width:] = array("i", range(width)) if wrap else array("i", [-1]) * width
+        left[::width] = array("i", range(width - 1, size, width)) if wrap else array("i", [-1]) * height
+        right[width - 1::width] = array("i", range(0, size, width)) if wrap else array("i", [-1]) * height
+        self._tables = (up, down, left, right)  # in the order of DIRECTIONS
+        self._seen = array("i", bytes(4 * size))
+        self._distance = array("i", bytes(4 * size))
+        self._first = array("b", bytes(size))
+        self._queue = array("i", bytes(4 * size))
+        self._search_id = 0
+        self._board = board
+
+    def _search(self, state: GameState, sources: Sequence[Tuple[Optional[str], int]], blocked: int, tail: int,
+                goals: Optional[Container[int]], wanted: int = 1) -> Tuple[Optional[str], int]:
+        """
+        Breadth-first search from ``sources`` over free cells, food and the (moving) tail.
+
+        Stops once ``wanted`` cells of ``goals`` (food cells if None) have been reached or
+        MAX_VISITED cells have been visited; with no goals it floods every reachable cell
+        up to that limit. Returns the direction of the first step towards the last goal
+        reached (None if not reached) and the number of cells visited.
+        """
+        if self._search_id == MAX_SEARCH_ID:
+            self._seen = array("i", bytes(len(self._seen)))
+            self._search_id = 0
+        self._search_id += 1
+        search_id = self._search_id
+        seen, distance, first, queue = self._seen, self._distance, self._first, self._queue
+        up, down, left, right = self._tables
+        grid = state.grid
+        seen[blocked] = search_id
+        count = 0
+        for direction, cell in sources:
+            if seen[cell] != search_id:
+                seen[cell] = search_id
+                distance[cell] = 0
+                first[cell] = -1 if direction is None else DIRECTION_INDEX[direction]
+                queue[count] = cell
+                count += 1
+
+        read = found = 0
+        while read < count:
+            cell = queue[read]
+            read += 1
+            if grid[cell] == FOOD if goals is None else cell in goals:
+                found += 1
+                if found == wanted:
+                    return DIRECTION_NAMES[first[cell]], count
+            if count >= MAX_VISITED:
+                break
+            for nxt in (up[cell], down[cell], left[cell], right[cell]):
+                if nxt >= 0 and seen[nxt] != search_id:
+                    value = grid[nxt]
+                    if value == EMPTY or value == FOOD or nxt == tail:
+                        seen[nxt] = search_id
+                        distance[nxt] = distance[cell] + 1
+                        first[nxt] = first[cell]
+                        queue[count] = nxt
+                        count += 1
+        return None, count
+
+
+pathfinding_bot = PathfindingBot()
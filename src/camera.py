@@ -0,0 +1,169 @@
+"""
+Scrolling view onto boards that are larger than the window.
+
+:class:`Camera` keeps a window-sized rectangle of cells around one snake and only
+moves when the snake gets close to the edge of the view. :class:`ChunkCache` keeps
+pre-rendered surfaces of CHUNK_CELLS x CHUNK_CELLS board cells for the chunks around
+the view. A frame blits the visible chunks (or, while the camera stands still, only the
+changed cells), so the drawing cost and the memory for surfaces depend on the window
+size and the cells that changed, never on the size of the board.
+"""
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import pygame
+
+from src.engine import GameState
+from src.palette import blit_cells
+
+CHUNK_CELLS = 32
+Color = Tuple[int, int, int]
+# (first board cell, number of cells, first view cell) of one contiguous piece of an axis
+Segment = Tuple[int, int, int]
+
+
+class Camera:
+    """
+    Top left board cell (``x``, ``y``) of a ``view_width`` x ``view_height`` view.
+
+    The followed cell is kept at least ``margin`` cells away from the edges of the view.
+    On wrapping boards the view wraps around as well; otherwise it stops at the border.
+    """
+
+    def __init__(self, board_width: int, board_height: int, view_width: int, view_height: int, wrap: bool,
+                 margin: Optional[int] = None):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.wrap = wrap
+        self.margin = min(view_width, view_height) // 4 if margin is None else margin
+        self.x = 0
+        self.y = 0
+
+    def _place(self, start: int, board: int, view: int) -> int:
+        if board <= view:
+            return 0
+        if self.wrap:
+            return start % board
+        return max(0, min(start, board - view))
+
+    def center(self, cell: int) -> None:
+        y, x = divmod(cell, self.board_width)
+        self.x = self._place(x - self.view_width // 2, self.board_width, self.view_width)
+        self.y = self._place(y - self.view_height // 2, self.board_height, self.view_height)
+
+    def _follow_axis(self, position: int, start: int, board: int, view: int) -> int:
+        offset = (position - start) % board if self.wrap else position - start
+        if offset < self.margin:
+            start = position - self.margin
+        elif offset >= view - self.margin:
+            start = position - view + self.margin + 1
+        return self._place(start, board, view)
+
+    def follow(self, cell: int) -> bool:
+        """Scrolls just enough to keep ``cell`` out of the margin; returns whether the view moved."""
+        y, x = divmod(cell, self.board_width)
+        new_x = self._follow_axis(x, self.x, self.board_width, self.view_width)
+        new_y = self._follow_axis(y, self.y, self.board_height, self.view_height)
+        moved = (new_x, new_y) != (self.x, self.y)
+        self.x, self.y = new_x, new_y
+        return moved
+
+    def to_view(self, cell: int) -> Optional[Tuple[int, int]]:
+        """Position of a board cell in the view (in cells), None if it is not visible."""
+        y, x = divmod(cell, self.board_width)
+        if self.wrap:
+            x = (x - self.x) % self.board_width
+            y = (y - self.y) % self.board_height
+        else:
+            x -= self.x
+            y -= self.y
+        if 0 <= x < min(self.view_width, self.board_width) and 0 <= y < min(self.view_height, self.board_height):
+            return x, y
+        return None
+
+    def _segments(self, start: int, board: int, view: int) -> List[Segment]:
+        length = min(view, board)
+        if start + length <= board:
+            return [(start, length, 0)]
+        first = board - start  # only on wrapping boards: the view continues at cell 0
+        return [(start, first, 0), (0, length - first, first)]
+
+    def segments(self) -> Tuple[List[Segment], List[Segment]]:
+        """The visible board cells per axis as up to two contiguous pieces each."""
+        return (self._segments(self.x, self.board_width, self.view_width),
+                self._segments(self.y, self.board_height, self.view_height))
+
+
+class ChunkCache:
+    """
+    Rendered chunks of the board, least recently used first, at most ``capacity`` of them.
+
+    ``palette`` maps every grid value to its color. Cells written to the grid must be
+    passed to :meth:`paint` so that cached chunks stay current; chunks that are not cached
+    are rendered from the grid when they are needed again.
+    """
+
+    def __init__(self, state: GameState, block_size: int, palette: List[Color], capacity: int):
+        self.state = state
+        self.block_size = block_size
+        self.palette = palette
+        self.capacity = capacity
+        self.chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+
+    def _render(self, cx: int, cy: int) -> pygame.Surface:
+        state = self.state
+        surface = pygame.Surface((CHUNK_CELLS * self.block_size, CHUNK_CELLS * self.block_size))
+        x0 = cx * CHUNK_CELLS
+        x1 = min(x0 + CHUNK_CELLS, state.width)
+        rows = range(cy * CHUNK_CELLS, min((cy + 1) * CHUNK_CELLS, state.height))
+        if len(rows) < CHUNK_CELLS or x1 - x0 < CHUNK_CELLS:
+            surface.fill(self.palette[0])  # chunk at the border, partly outside the board
+        cells = b"".join(state.grid[y * state.width + x0:y * state.width + x1] for y in rows)
+        blit_cells(surface, cells, x1 - x0, len(rows), self.palette, self.block_size, (0, 0))
+        return surface
+
+    def get(self, cx: int, cy: int) -> pygame.Surface:
+        surface = self.chunks.get((cx, cy))
+        if surface is None:
+            surface = self.chunks[(cx, cy)] = self._render(cx, cy)
+            if len(self.chunks) > self.capacity:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end((cx, cy))
+        return surface
+
+    def clear(self) -> None:
+        self.chunks.clear()
+
+    def paint(self, cell: int) -> None:
+        """Repaints one changed cell in its chunk, if that chunk is cached."""
+        y, x = divmod(cell, self.state.width)
+        surface = self.chunks.get((x // CHUNK_CELLS, y // CHUNK_CELLS))
+        if surface is not None:
+            surface.fill(self.palette[self.state.grid[cell]],
+                         ((x % CHUNK_CELLS) * self.block_size, (y % CHUNK_CELLS) * self.block_size,
+                          self.block_size, self.block_size))
+
+    def blit_view(self, target: pygame.Surface, camera: Camera, origin: Tuple[int, int]) -> None:
+        """Draws the camera's view onto ``target`` with its top left cell at pixel ``origin``."""
+        left, top = origin
+        bs = self.block_size
+        x_segments, y_segments = camera.segments()
+        for board_y, height, view_y in y_segments:
+            for board_x, width, view_x in x_segments:
+                for cy in range(board_y // CHUNK_CELLS, (board_y + height - 1) // CHUNK_CELLS + 1):
+                    y0 = max(board_y, cy * CHUNK_CELLS)
+                    y1 = min(board_y + height, (cy + 1) * CHUNK_CELLS)
+                    for cx in range(board_x // CHUNK_CELLS, (board_x + width - 1) // CHUNK_CELLS + 1):
+                        x0 = max(board_x, cx * CHUNK_CELLS)
+                        x1 = min(board_x + width, (cx + 1) * CHUNK_CELLS)
+                        area = ((x0 - cx * CHUNK_CELLS) * bs, (y0 - cy * CHUNK_CELLS) * bs, (x1 - x0) * bs, (y1 - y0) * bs)
+                        dest = (left + (view_x + x0 - board_x) * bs, top + (view_y + y0 - board_y) * bs)
+                        target.blit(self.get(cx, cy), dest, area)
+
+
+def chunks_in_view(view_width: int, view_height: int) -> int:
+    """Most chunks a view can overlap: an unaligned view touches one more per axis, a wrapped one two."""
+    return (view_width // CHUNK_CELLS + 3) * (view_height // CHUNK_CELLS + 3)
@@ -0,0 +1,80 @@
+"""
+Headless client for the game server: a socket plus a local copy of the server's state.
+
+:class:`NetClient` does not block after connecting, so it can be polled from the
+pygame loop once per frame (see ``src/network.py``) or driven by scripts and tests.
+With ``predict`` the own snake in ``state`` runs ahead of the server, see
+:mod:`src.prediction`.
+"""
+import socket
+from typing import List, Optional, Tuple
+
+from src.engine import GameState
+from src.prediction import Prediction
+from src.protocol import (ACK, DELTA, ERROR, GAME_OVER, SNAPSHOT, WELCOME, FrameClient, apply_delta, apply_snapshot,
+                          decode_ack, decode_error, decode_game_over, decode_welcome, encode_input, encode_join)
+
+
+class NetClient(FrameClient):
+    """
+    Connection to one room. ``state`` is None until the room starts; after that it is
+    updated by :meth:`poll` with every snapshot and delta the server sends.
+    """
+
+    def __init__(self, host: str, port: int, room: str, name: str, timeout: float = 5.0, predict: bool = True):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(encode_join(room, name))
+        super().__init__(sock)
+        self.state: Optional[GameState] = None
+        self.snake_index: Optional[int] = None
+        self.tick_rate: Optional[int] = None
+        self.game_over = False
+        self.winner: Optional[int] = None
+        self.seq = 0
+        self.predict = predict
+        self.prediction: Optional[Prediction] = None
+
+    def send_input(self, direction: str) -> int:
+        """Sends a turn for the own snake and returns its sequence number."""
+        if self.prediction is not None and not self.prediction.wants(direction):
+            return self.seq
+        self.seq += 1
+        if self.connected:
+            try:
+                self.sock.sendall(encode_input(self.seq, direction))
+            except OSError:
+                self.connected = False
+        if self.prediction is not None:
+            self.prediction.add(self.seq, direction)
+        return self.seq
+
+    def poll(self) -> List[Tuple[int, bytes]]:
+        """Reads everything the server has sent so far, applies it and returns the frames."""
+        messages = self._receive()
+        if messages and self.prediction is not None:
+            self.prediction.rewind()
+        self._handle_all(messages)
+        if messages and self.prediction is not None:
+            self.prediction.replay()
+        return messages
+
+    def handle(self, msg_type: int, payload: bytes) -> None:
+        if msg_type == WELCOME:
+            self.snake_index, self.tick_rate, self.state = decode_welcome(payload)
+            if self.predict:
+                self.prediction = Prediction(self.state, self.snake_index)
+        elif msg_type == SNAPSHOT and self.state is not None:
+            apply_snapshot(self.state, payload)
+        elif msg_type == DELTA and self.state is not None:
+            apply_delta(self.state, payload)
+        elif msg_type == ACK and self.prediction is not None:
+            self.prediction.ack(decode_ack(payload))
+        elif msg_type == GAME_OVER:
+            self.winner = decode_game_over(payload)
+            self.game_over = True
+            if self.state is not None:
+                self.state.winner = self.winner
+                self.state.game_over = True
+        elif msg_type == ERROR:
+            self.error = decode_error(payload)
@@ -1,30 +1,74 @@
-import json
-import os
+import threading
+import time
 import logging
+from datetime import datetime
 from typing import Optional, List, Tuple
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extras import execute_values
+from src.score_store import HighscoreRow, LeaderboardCursor, ScoreStore, best_per_player, load_config
 
 # Logger für Fehler und Warnungen
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Verbindungsstatus von DBScore
+STATUS_CONNECTING = "connecting"
+STATUS_READY = "ready"
+STATUS_UNAVAILABLE = "unavailable"
 
-class DBScore:
+DEFAULT_CONNECT_TIMEOUT = 5  # Sekunden
+RECONNECT_INTERVAL = 30  # Sekunden zwischen zwei Verbindungsversuchen
+
+# Schema-Migrationen, werden der Reihe nach genau einmal ausgeführt (Stand in schema_version)
+MIGRATIONS = [
+    # 1: Tabelle aller Spiele
+    """
+    CREATE TABLE IF NOT EXISTS gamescore (
+        id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        achieved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # 2: Index auf score und Bestenliste mit dem besten Score pro Spieler
+    """
+    CREATE INDEX IF NOT EXISTS gamescore_score_idx ON gamescore (score DESC);
+    CREATE TABLE IF NOT EXISTS player_best (
+        name TEXT PRIMARY KEY,
+        score INTEGER NOT NULL,
+        achieved_at TIMESTAMP NOT NULL
+    );
+    INSERT INTO player_best (name, score, achieved_at)
+        SELECT DISTINCT ON (name) name, score, achieved_at
+        FROM gamescore
+        ORDER BY name, score DESC, achieved_at
+    ON CONFLICT (name) DO NOTHING;
+    CREATE INDEX IF NOT EXISTS player_best_score_idx ON player_best (score DESC, name)
+    """,
+]
+MIGRATION_LOCK_ID = 0x5E4E  # pg_advisory_xact_lock-Schlüssel, damit nur ein Client migriert
+
+ACHIEVED_AT_COLUMN = "TO_CHAR(achieved_at AT TIME ZONE 'UTC' AT TIME ZONE 'Europe/Berlin', 'YYYY-MM-DD HH24:MI')"
+
+
+class DBScore(ScoreStore):
     def __init__(self, config_path: Optional[str] = None):
         """
         Initialisiert die Datenbankverbindung mit Werten aus der JSON-Konfigurationsdatei.
         Die Konfigurationsdatei muss alle erforderlichen Werte enthalten.
 
+        Der Connection Pool wird in einem Hintergrund-Thread aufgebaut, damit das Spiel sofort
+        startet, auch ohne Netzwerk. Bis die Datenbank erreichbar ist, liefern die Methoden
+        nach ``DB_CONNECT_TIMEOUT`` Sekunden Fehlerwerte (False bzw. leere Liste); ``status``
+        zeigt den aktuellen Verbindungszustand.
+
         :param config_path: Pfad zur Konfigurationsdatei (optional)
         :raises FileNotFoundError: Wenn die Konfigurationsdatei nicht gefunden wird.
         :raises json.JSONDecodeError: Wenn die Konfigurationsdatei ungültig ist.
         :raises KeyError: Wenn ein erforderlicher Konfigurationswert fehlt.
         """
-        if config_path is None:
-            config_path = os.path.join(os.path.dirname(__file__), "..", "config.json")
-
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
         self._validate_config()
 
         # Konfigurationswerte setzen
@@ -34,33 +78,91 @@ class DBScore:
         self.database = self.config["DB_NAME"]
         self.port = self.config["DB_PORT"]
         self.sslmode = self.config["DB_SSLMODE"]
+        self.connect_timeout = int(self.config.get("DB_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+
+        # Connection Pool für bessere Leistung, wird lazy im Hintergrund aufgebaut
+        self.connection_pool: Optional[pool.ThreadedConnectionPool] = None
+        self.status = STATUS_CONNECTING
+        self._pool_lock = threading.Lock()
+        self._attempt_done = threading.Event()
+        self._connect_thread: Optional[threading.Thread] = None
+        self._last_attempt = 0.0
+        self.connect_async()
 
-        # Connection Pool für bessere Leistung
-        self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-            minconn=1,
-            maxconn=10,
-            dbname=self.database,
-            user=self.user,
-            password=self.password,
-            host=self.host,
-            port=self.port,
-            sslmode=self.sslmode,
-        )
+    @property
+    def is_available(self) -> bool:
+        return self.status == STATUS_READY
 
-    def _load_config(self, config_path: str) -> dict:
+    def connect_async(self) -> None:
+        """Startet den Verbindungsaufbau im Hintergrund, falls kein Pool existiert und kein Versuch läuft."""
+        with self._pool_lock:
+            if self.connection_pool is not None:
+                return
+            if self._connect_thread is not None and self._connect_thread.is_alive():
+                return
+            self.status = STATUS_CONNECTING
+            self._attempt_done.clear()
+            self._last_attempt = time.monotonic()
+            self._connect_thread = threading.Thread(target=self._connect, name="DBConnect", daemon=True)
+            self._connect_thread.start()
+
+    def _connect(self) -> None:
+        try:
+            # ThreadedConnectionPool, weil Score-Writer und Highscore-Cache aus eigenen Threads zugreifen
+            connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                minconn=1,
+                maxconn=10,
+                dbname=self.database,
+                user=self.user,
+                password=self.password,
+                host=self.host,
+                port=self.port,
+                sslmode=self.sslmode,
+                connect_timeout=self.connect_timeout,
+            )
+        except psycopg2.Error as err:
+            logger.error(f"❌ Datenbank nicht erreichbar: {err}")
+            self.status = STATUS_UNAVAILABLE
+        else:
+            if self._migrate(connection_pool):
+                self.connection_pool = connection_pool
+                self.status = STATUS_READY
+                logger.info("✅ Datenbankverbindung hergestellt")
+            else:
+                # ohne aktuelles Schema würden alle Abfragen fehlschlagen; nach RECONNECT_INTERVAL neu versuchen
+                connection_pool.closeall()
+                self.status = STATUS_UNAVAILABLE
+        finally:
+            self._attempt_done.set()
+
+    def _migrate(self, connection_pool: pool.ThreadedConnectionPool) -> bool:
         """
-        Lädt die Konfigurationsdaten aus der JSON-Datei.
+        Bringt das Datenbankschema auf den Stand von MIGRATIONS.
 
-        :param config_path: Pfad zur Konfigurationsdatei
-        :return: Konfigurationsdaten als Dictionary
-        :raises FileNotFoundError: Wenn die Datei nicht gefunden wird.
-        :raises json.JSONDecodeError: Wenn die Datei ungültig ist.
+        :return: True bei Erfolg, False bei Fehlern (dann wurde keine Migration übernommen)
         """
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Konfigurationsdatei {config_path} nicht gefunden!")
+        conn = connection_pool.getconn()
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+                cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+                current = cursor.fetchone()[0]
+                for version, migration in enumerate(MIGRATIONS[current:], start=current + 1):
+                    cursor.execute(migration)
+                    cursor.execute("INSERT INTO schema_version (version) VALUES (%s)", (version,))
+                    logger.info(f"✅ Datenbankschema auf Version {version} migriert")
+            return True
+        except psycopg2.Error as err:
+            logger.error(f"❌ Fehler bei der Schema-Migration: {err}")
+            return False
+        finally:
+            connection_pool.putconn(conn)
 
-        with open(config_path, "r", encoding="utf-8") as file:
-            return json.load(file)
+    def close(self) -> None:
+        """Schließt alle Verbindungen des Pools."""
+        if self.connection_pool is not None:
+            self.connection_pool.closeall()
 
     def _validate_config(self) -> None:
         """
@@ -76,30 +178,39 @@ class DBScore:
     def _get_connection(self):
         """
         Gibt eine Datenbankverbindung aus dem Connection Pool zurück.
+        Wartet höchstens ``connect_timeout`` Sekunden auf einen laufenden Verbindungsaufbau
+        und startet nach ``RECONNECT_INTERVAL`` Sekunden einen neuen Versuch.
 
         :return: Datenbankverbindung oder None bei Fehlern
         """
+        if self.connection_pool is None:
+            if self.status == STATUS_UNAVAILABLE and time.monotonic() - self._last_attempt > RECONNECT_INTERVAL:
+                self.connect_async()
+            self._attempt_done.wait(self.connect_timeout)
+            if self.connection_pool is None:
+                return None
         try:
             return self.connection_pool.getconn()
         except psycopg2.Error as err:
             logger.error(f"❌ Fehler beim Herstellen der Datenbankverbindung: {err}")
             return None
 
-    def insert_score(self, player_name: str, score: int) -> bool:
+    def insert_scores(self, scores: List[Tuple[str, int, datetime]]) -> bool:
         """
-        Fügt den übergebenen Score zusammen mit dem Spielernamen und dem aktuellen Zeitstempel in die Datenbank ein.
+        Fügt mehrere Scores in einem einzigen mehrzeiligen INSERT ein und aktualisiert
+        in derselben Transaktion die Bestenliste.
 
-        :param player_name: Name des Spielers
-        :param score: Score des Spielers
-        :return: True bei Erfolg, False bei Fehlern
+        :param scores: Liste von (Spielername, Score, Zeitpunkt in UTC)
+        :return: True bei Erfolg, False bei Fehlern (dann wurde nichts eingefügt)
         """
-        if score <= 0:
-            logger.warning("⚠️ Score muss größer als 0 sein!")
-            return False
+        if not scores:
+            return True
 
-        query = """
-            INSERT INTO gamescore (name, score, achieved_at)
-            VALUES (%s, %s, CURRENT_TIMESTAMP)
+        query = "INSERT INTO gamescore (name, score, achieved_at) VALUES %s"
+        best_query = """
+            INSERT INTO player_best (name, score, achieved_at) VALUES %s
+            ON CONFLICT (name) DO UPDATE SET score = EXCLUDED.score, achieved_at = EXCLUDED.achieved_at
+            WHERE player_best.score < EXCLUDED.score
         """
 
         conn = self._get_connection()
@@ -108,11 +219,12 @@ class DBScore:
 
         try:
             with conn, conn.cursor() as cursor:
-                cursor.execute(query, (player_name, score))
-                logger.info("✅ Score erfolgreich eingefügt!")
+                execute_values(cursor, query, scores)
+                execute_values(cursor, best_query, best_per_player(scores))
+                logger.info(f"✅ {len(scores)} Score(s) erfolgreich eingefügt!")
                 return True
         except psycopg2.Error as err:
-            logger.error(f"❌ Fehler beim Einfügen des Scores: {err}")
+            logger.error(f"❌ Fehler beim Einfügen der Scores: {err}")
             return False
         finally:
             self.connection_pool.putconn(conn)
@@ -125,9 +237,8 @@ class DBScore:
         :param limit: Maximale Anzahl der zurückgegebenen Scores
         :return: Liste der Top-Scores
         """
-        query = """
-            SELECT name, score, TO_CHAR(achieved_at AT TIME ZONE 'UTC' 
-            AT TIME ZONE 'Europe/Berlin', 'YYYY-MM-DD HH24:MI') AS achieved_at
+        query = f"""
+            SELECT name, score, {ACHIEVED_AT_COLUMN} AS achieved_at
             FROM gamescore
             ORDER BY score DESC
             LIMIT %s
@@ -146,3 +257,87 @@ class DBScore:
             return []
         finally:
             self.connection_pool.putconn(conn)
+
+    def get_leaderboard(self, limit: int = 10, after: Optional[LeaderboardCursor] = None) -> List[HighscoreRow]:
+        """
+        Gibt eine Seite der Bestenliste zurück (bester Score pro Spieler, absteigend nach Score,
+        bei Gleichstand nach Name). Liest per Keyset-Pagination über den Index player_best_score_idx.
+
+        :param limit: Maximale Anzahl der Einträge pro Seite
+        :param after: Cursor der vorherigen Seite, None für die erste Seite
+        :return: Liste von (Spielername, Score, Erreicht-Zeitpunkt)
+        """
+        if after is None:
+            where, params = "", (limit,)
+        else:
+            after_score, after_name = after
+            where = "WHERE score < %s OR (score = %s AND name > %s)"
+            params = (after_score, after_score, after_name, limit)
+        query = f"""
+            SELECT name, score, {ACHIEVED_AT_COLUMN} AS achieved_at
+            FROM player_best
+            {where}
+            ORDER BY score DESC, name
+            LIMIT %s
+        """
+
+        conn = self._get_connection()
+        if conn is None:
+            return []
+
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        except psycopg2.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen der Bestenliste: {err}")
+            return []
+        finally:
+            self.connection_pool.putconn(conn)
+
+    def get_player_best(self, player_name: str) -> Optional[int]:
+        """
+        Gibt den besten Score eines Spielers zurück.
+
+        :param player_name: Name des Spielers
+        :return: Bester Score oder None, wenn der Spieler keinen Score hat oder ein Fehler auftrat
+        """
+        query = "SELECT score FROM player_best WHERE name = %s"
+
+        conn = self._get_connection()
+        if conn is None:
+            return None
+
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute(query, (player_name,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except psycopg2.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen des besten Scores: {err}")
+            return None
+        finally:
+            self.connection_pool.putconn(conn)
+
+    def get_rank(self, score: int) -> Optional[int]:
+        """
+        Gibt den Platz zurück, den ein Score in der Bestenliste (ein Eintrag pro Spieler) erreichen würde.
+
+        :param score: Zu bewertender Score
+        :return: Platz (1 = bester Score) oder None bei Fehlern
+        """
+        query = "SELECT COUNT(*) + 1 FROM player_best WHERE score > %s"
+
+        conn = self._get_connection()
+        if conn is None:
+            return None
+
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute(query, (score,))
+                return cursor.fetchone()[0]
+        except psycopg2.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen des Rangs: {err}")
+            return None
+        finally:
+            self.connection_pool.putconn(conn)
@@ -0,0 +1,392 @@
+"""
+Headless simulation core for Snake.
+
+Everything in this module works on board cells (column, row) and does not
+import pygame, so a game can be advanced without a window or a frame clock.
+The pygame classes in ``singleplayer.py`` and ``multiplayer.py`` only render
+the state and feed the player input into :func:`step`.
+"""
+import random
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+Cell = Tuple[int, int]
+
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+START_LENGTH = 3
+MULTIPLAYER_OFFSET = 5
+
+# Values of the occupancy grid: 0 is a free cell, 1..254 is the owner (snake index + 1)
+EMPTY = 0
+FOOD = 255
+
+
+class SnakeBody:
+    """
+    Snake segments as packed cell indices (``y * width + x``), head first.
+
+    Backed by a deque, so adding the head and dropping the tail are O(1) and a
+    tick allocates nothing but the new int. Iteration runs from head to tail.
+    """
+    __slots__ = ("_cells",)
+
+    def __init__(self, cells: Iterable[int] = ()):
+        self._cells = deque(cells)
+
+    @property
+    def head(self) -> int:
+        return self._cells[0]
+
+    @property
+    def tail(self) -> int:
+        return self._cells[-1]
+
+    def push_head(self, cell: int) -> None:
+        self._cells.appendleft(cell)
+
+    def pop_tail(self) -> int:
+        return self._cells.pop()
+
+    def pop_head(self) -> int:
+        return self._cells.popleft()
+
+    def push_tail(self, cell: int) -> None:
+        self._cells.append(cell)
+
+    def clear(self) -> None:
+        self._cells.clear()
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cells)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self._cells
+
+
+class Snake:
+    """A single snake: its body, heading, score and alive flag."""
+
+    def __init__(self, body: Iterable[int], direction: str = "RIGHT"):
+        self.body = SnakeBody(body)
+        self.direction = direction
+        self.score = 0
+        self.alive = True
+
+    @property
+    def head(self) -> int:
+        return self.body.head
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def turn(self, change_to: Optional[str]) -> None:
+        """Applies a requested direction unless it would reverse the snake."""
+        if change_to in DIRECTIONS and change_to != OPPOSITE[self.direction]:
+            self.direction = change_to
+
+
+class FreeCells:
+    """
+    Set of free board cells with O(1) add, remove and uniform random sampling.
+
+    ``cells`` holds the free cells in no particular order and ``slots`` maps every
+    cell to its position in ``cells`` (-1 if occupied). Removal swaps the last
+    entry into the gap, so no operation depends on the board size or occupancy.
+
+    Both are ``array('i')``: 8 bytes per board cell in total, 8 MB on a 1000x1000
+    board, where two lists of ints would take about 16 bytes per cell plus the int objects.
+    """
+    __slots__ = ("cells", "slots")
+
+    def __init__(self, size: int):
+        self.cells = array("i", range(size))
+        self.slots = array("i", range(size))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return self.slots[cell] >= 0
+
+    def add(self, cell: int) -> None:
+        if self.slots[cell] < 0:
+            self.slots[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell: int) -> None:
+        slot = self.slots[cell]
+        if slot < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[cell] = -1
+
+    def sample(self, rng: random.Random) -> Optional[int]:
+        """A uniformly chosen free cell, or None if the board is full."""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class GameState:
+    """
+    Complete state of one board. ``wrap`` selects wrap-around instead of wall death.
+
+    Cells are packed as ``y * width + x`` everywhere (snake bodies, food, grid).
+    ``grid`` is a flat occupancy map with one byte per cell holding EMPTY, FOOD or
+    the owner id of a snake segment. It is kept in sync with the snake
+    bodies and the food list on every tick, so all cell lookups are constant-time.
+    ``free`` indexes the EMPTY cells of the grid for food spawning; all grid writes go
+    through :meth:`set_cell` to keep both in sync.
+
+    ``seed`` seeds the food RNG so that spawns can be reproduced.
+
+    With ``last_snake_wins`` the game runs until at most one snake is left, which is then
+    the winner (party mode). Otherwise it ends with the first snake-vs-snake collision or
+    when no snake is left.
+
+    Renderers can set ``changed`` to a set; every cell written from then on is added
+    to it until the renderer clears it. Headless runs leave it at None and pay nothing.
+    """
+
+    def __init__(self, width: int, height: int, snakes: List[Snake], wrap: bool = False, num_food: int = 1,
+                 seed: Optional[int] = None, last_snake_wins: bool = False):
+        if len(snakes) >= FOOD:
+            raise ValueError(f"At most {FOOD - 1} snakes fit on one board")
+        self.width = width
+        self.height = height
+        self.snakes = snakes
+        self.grid = bytearray(width * height)
+        self.free = FreeCells(width * height)
+        self.changed: Optional[Set[int]] = None
+        for owner, snake in enumerate(snakes, start=1):
+            for cell in snake.body:
+                self.set_cell(cell, owner)
+        self.wrap = wrap
+        self.last_snake_wins = last_snake_wins
+        self.num_food = num_food
+        self.food: List[Optional[int]] = [None] * num_food
+        self.board_full = False
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.game_over = False
+        self.winner: Optional[int] = None  # index of the winning snake, None for a tie
+        spawn_food(self)
+
+    def index(self, cell: Cell) -> int:
+        """Packs an (x, y) cell into its grid index."""
+        return cell[1] * self.width + cell[0]
+
+    def cell(self, index: int) -> Cell:
+        """Unpacks a grid index into its (x, y) cell."""
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def set_cell(self, cell: int, value: int) -> None:
+        """Writes one grid cell and updates the free-cell index."""
+        self.grid[cell] = value
+        if self.changed is not None:
+            self.changed.add(cell)
+        if value == EMPTY:
+            self.free.add(cell)
+        else:
+            self.free.remove(cell)
+
+    def kill(self, snake_index: int) -> None:
+        """Removes a snake from the board, freeing every cell it still owns."""
+        snake = self.snakes[snake_index]
+        owner = snake_index + 1
+        for cell in snake.body:
+            if self.grid[cell] == owner:
+                self.set_cell(cell, EMPTY)
+        snake.alive = False
+        snake.body.clear()
+
+
+def _start_body(width: int, x: int, y: int) -> List[int]:
+    return [y * width + x - i for i in range(START_LENGTH)]
+
+
+def new_singleplayer_state(width: int, height: int, seed: Optional[int] = None) -> GameState:
+    """One snake in the middle of the board, walls are deadly, one food item."""
+    snake = Snake(_start_body(width, width // 2, height // 2))
+    return GameState(width, height, [snake], wrap=False, num_food=1, seed=seed)
+
+
+def new_multiplayer_state(width: int, height: int, seed: Optional[int] = None) -> GameState:
+    """Two snakes side by side, the board wraps around, two food items."""
+    center_x, center_y = width // 2, height // 2
+    snakes = [
+        Snake(_start_body(width, center_x, center_y)),
+        Snake(_start_body(width, center_x + MULTIPLAYER_OFFSET, center_y)),
+    ]
+    return GameState(width, height, snakes, wrap=True, num_food=2, seed=seed)
+
+
+def new_party_state(width: int, height: int, players: int, seed: Optional[int] = None) -> GameState:
+    """``players`` snakes in evenly spaced rows, the board wraps around, one food item per snake."""
+    if not 2 <= players <= height:
+        raise ValueError(f"Party mode needs between 2 and {height} snakes on this board")
+    snakes = [Snake(_start_body(width, width // 2, row * height // players + height // (2 * players)))
+              for row in range(players)]
+    return GameState(width, height, snakes, wrap=True, num_food=players, seed=seed, last_snake_wins=True)
+
+
+def spawn_food(state: GameState) -> bool:
+    """
+    Fills every empty food slot with a random free cell.
+
+    Returns False and sets ``state.board_full`` if there was no free cell left for a
+    slot; that slot stays empty and is filled on a later tick once cells free up.
+    """
+    state.board_full = False
+    for slot, food in enumerate(state.food):
+        if food is not None:
+            continue
+        cell = state.free.sample(state.rng)
+        if cell is None:
+            state.board_full = True
+            return False
+        state.set_cell(cell, FOOD)
+        state.food[slot] = cell
+    return True
+
+
+def _next_head(state: GameState, snake: Snake) -> Optional[int]:
+    """Packed cell in front of the snake, or None if it would leave a board without wrapping."""
+    dx, dy = DIRECTIONS[snake.direction]
+    y, x = divmod(snake.head, state.width)
+    x += dx
+    y += dy
+    if state.wrap:
+        x %= state.width
+        y %= state.height
+    elif not (0 <= x < state.width and 0 <= y < state.height):
+        return None
+    return y * state.width + x
+
+
+def _move(state: GameState, snake_index: int) -> None:
+    """
+    Moves one snake by a cell, eating food or dropping the tail.
+
+    The new head is not written into the grid yet, so that every snake sees the
+    board with all tails already removed when collisions are resolved.
+    """
+    snake = state.snakes[snake_index]
+    head = _next_head(state, snake)
+    if head is None:
+        state.kill(snake_index)
+        return
+    if state.grid[head] == FOOD:
+        snake.score += 1
+        state.set_cell(head, EMPTY)
+        state.food[state.food.index(head)] = None
+    else:
+        state.set_cell(snake.body.pop_tail(), EMPTY)
+    snake.body.push_head(head)
+
+
+def _find_snake_collisions(state: GameState) -> Set[int]:
+    """
+    Returns the snakes that lose a head-into-snake collision this tick.
+
+    One pass over the heads: only heads move, so it is enough to look up each new head
+    in the grid (hits on bodies and on previous heads of other snakes) and in a map of
+    this tick's heads (heads entering the same cell). The cost grows with the number of
+    snakes, not their length. All collisions are judged on the lengths before anybody
+    is removed, so the order of the snakes does not matter.
+    """
+    heads: Dict[int, int] = {}  # cell -> longest snake whose head entered it this tick
+    losers: Set[int] = set()
+    for owner, snake in enumerate(state.snakes, start=1):
+        if not snake.alive:
+            continue
+        cell_owner = state.grid[snake.head]
+        if cell_owner != EMPTY and cell_owner != FOOD and cell_owner != owner:
+            losers.update(_collision_losers(state, owner - 1, cell_owner - 1))
+        other = heads.get(snake.head)
+        if other is None:
+            heads[snake.head] = owner - 1
+        else:
+            losers.update(_collision_losers(state, other, owner - 1))
+            if len(snake) > len(state.snakes[other]):
+                heads[snake.head] = owner - 1
+    return losers
+
+
+def _collision_losers(state: GameState, i: int, j: int) -> Tuple[int, ...]:
+    """The longer snake eats the shorter one, equal lengths kill both."""
+    if len(state.snakes[i]) > len(state.snakes[j]):
+        return (j,)
+    if len(state.snakes[j]) > len(state.snakes[i]):
+        return (i,)
+    return i, j
+
+
+def _resolve_collisions(state: GameState) -> None:
+    """Self collisions remove a snake; in snake-vs-snake collisions the longer snake eats the shorter one."""
+    for owner, snake in enumerate(state.snakes, start=1):
+        if snake.alive and state.grid[snake.head] == owner:
+            state.kill(owner - 1)
+
+    losers = _find_snake_collisions(state)
+    if not losers:
+        return
+    for i in sorted(losers):
+        state.kill(i)
+    if not state.last_snake_wins:
+        alive = [i for i, snake in enumerate(state.snakes) if snake.alive]
+        state.winner = alive[0] if len(alive) == 1 else None
+        state.game_over = True
+
+
+def _place_heads(state: GameState) -> None:
+    for owner, snake in enumerate(state.snakes, start=1):
+        if snake.alive:
+            state.set_cell(snake.head, owner)
+
+
+def step(state: GameState, actions: Sequence[Optional[str]]) -> GameState:
+    """
+    Advances the game by one tick.
+
+    ``actions`` holds the requested direction per snake (or None to keep going straight).
+    The state is updated in place and returned.
+    """
+    if state.game_over:
+        return state
+    state.tick += 1
+
+    for snake, action in zip(state.snakes, actions):
+        if snake.alive:
+            snake.turn(action)
+    for i, snake in enumerate(state.snakes):
+        if snake.alive:
+            _move(state, i)
+
+    _resolve_collisions(state)
+    _place_heads(state)
+    alive = [i for i, snake in enumerate(state.snakes) if snake.alive]
+    if state.last_snake_wins and len(alive) <= 1:
+        state.winner = alive[0] if alive else None
+        state.game_over = True
+    elif not alive:
+        state.game_over = True
+    if not state.game_over:
+        spawn_food(state)
+    return state
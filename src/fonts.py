@@ -0,0 +1,35 @@
+"""
+Shared font registry and text surface cache.
+
+``pygame.font.SysFont`` resolves the system font on every call and menus render the
+same strings every frame, so fonts are loaded once per (name, size) and rendered
+text surfaces are kept in an LRU cache keyed by (font, text, color).
+Cached surfaces are shared: blit them, but never draw onto them.
+"""
+from functools import lru_cache
+from typing import Dict, Tuple
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+_fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+
+def get_font(name: str, size: int) -> pygame.font.Font:
+    """Returns the font for (name, size), loading it on first use."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    """Renders antialiased text once and returns the cached surface afterwards."""
+    return font.render(text, True, color)
+
+
+def clear_cache() -> None:
+    """Drops all fonts and cached surfaces, e.g. after ``pygame.quit()``."""
+    render_text.cache_clear()
+    _fonts.clear()
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from src.score_store import HighscoreRow, format_achieved_at
+
+logger = logging.getLogger(__name__)
+
+
+class HighscoreCache:
+    def __init__(self, fetch: Callable[[int], List[HighscoreRow]], cache_path: Optional[str] = None,
+                 limit: int = 10, ttl: float = 60.0):
+        """
+        Lokaler Top-N-Cache für den Highscore-Bildschirm (stale-while-revalidate).
+
+        ``get()`` liefert sofort die zwischengespeicherten Scores, auch offline. Sind sie
+        älter als ``ttl`` Sekunden, werden sie im Hintergrund über ``fetch`` neu geladen.
+        Der Cache wird auf der Festplatte gespeichert, damit er auch direkt nach dem Start
+        verfügbar ist.
+
+        :param fetch: Funktion, die die Bestenliste lädt, z.B. ``ScoreStore.get_leaderboard``
+        :param cache_path: Pfad zur Cache-Datei (optional)
+        :param limit: Anzahl der zwischengespeicherten Scores
+        :param ttl: Gültigkeitsdauer des Caches in Sekunden
+        """
+        if cache_path is None:
+            cache_path = os.path.join(os.path.dirname(__file__), "..", "highscores.json")
+
+        self.fetch = fetch
+        self.cache_path = cache_path
+        self.limit = limit
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._refreshing = False
+        self._fetched_at = 0.0  # monotonic time of the last successful fetch, 0 = never
+        self._generation = 0  # counts record() calls
+        self._recorded: List[Tuple[int, List[Tuple[str, int, datetime]]]] = []  # (generation, rows) of record()
+        self._scores: List[HighscoreRow] = self._load()
+
+    def get(self) -> List[HighscoreRow]:
+        """
+        Gibt die zwischengespeicherten Top-Scores zurück, ohne zu blockieren.
+
+        :return: Liste der Top-Scores (Spielername, Score, Erreicht-Zeitpunkt)
+        """
+        if self.is_stale():
+            self.refresh()
+        with self._lock:
+            return list(self._scores)
+
+    def is_stale(self) -> bool:
+        return self._fetched_at == 0.0 or time.monotonic() - self._fetched_at > self.ttl
+
+    def refresh(self) -> None:
+        """Startet ein Neuladen im Hintergrund, falls nicht schon eines läuft."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="HighscoreRefresh", daemon=True).start()
+
+    def record(self, rows: List[Tuple[str, int, datetime]]) -> None:
+        """
+        Trägt erfolgreich gespeicherte Scores sofort in den Cache ein (optimistisches Update).
+
+        :param rows: Liste von (Spielername, Score, Zeitpunkt in UTC)
+        """
+        with self._lock:
+            self._generation += 1
+            self._recorded.append((self._generation, list(rows)))
+            self._scores = self._merge(self._scores, rows)
+            snapshot = list(self._scores)
+        self._save(snapshot)
+
+    def _merge(self, scores: List[HighscoreRow], rows: List[Tuple[str, int, datetime]]) -> List[HighscoreRow]:
+        # The leaderboard holds one entry per player, so a new score only replaces a lower one
+        best = {name: (name, score, achieved_at) for name, score, achieved_at in scores}
+        for name, score, achieved_at in rows:
+            if name not in best or score > best[name][1]:
+                best[name] = (name, score, format_achieved_at(achieved_at))
+        return sorted(best.values(), key=lambda row: (-row[1], row[0]))[:self.limit]
+
+    def _refresh(self) -> None:
+        with self._lock:
+            started = self._generation
+        try:
+            scores = self.fetch(self.limit)
+        except Exception as err:  # the cache must stay usable whatever the backend raises
+            logger.error(f"❌ Fehler beim Aktualisieren der Highscores: {err}")
+            scores = None
+        with self._lock:
+            self._refreshing = False
+            # get_top_scores() answers errors with an empty list, so that is kept as "no data"
+            if not scores:
+                return
+            self._scores = [(name, score, achieved_at) for name, score, achieved_at in scores]
+            # scores recorded while the fetch was running may be missing from its result
+            self._recorded = [(generation, rows) for generation, rows in self._recorded if generation > started]
+            for _, rows in self._recorded:
+                self._scores = self._merge(self._scores, rows)
+            self._fetched_at = time.monotonic()
+            snapshot = list(self._scores)
+        self._save(snapshot)
+
+    def _load(self) -> List[HighscoreRow]:
+        if not os.path.exists(self.cache_path):
+            return []
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                return [(name, score, achieved_at) for name, score, achieved_at in json.load(file)]
+        except (OSError, ValueError) as err:
+            logger.error(f"❌ Fehler beim Lesen des Highscore-Caches: {err}")
+            return []
+
+    def _save(self, scores: List[HighscoreRow]) -> None:
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with self._save_lock:
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump(scores, file, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+        except OSError as err:
+            logger.error(f"❌ Fehler beim Speichern des Highscore-Caches: {err}")
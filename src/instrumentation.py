@@ -0,0 +1,154 @@
+"""
+Per-phase timers and counters for the game loop.
+
+A :class:`Profiler` collects how long each phase of a frame took (events, simulation
+ticks, drawing, and on request the engine's move / collision / food phases and the
+score store calls) in log-scaled histograms, plus plain counters such as cells drawn.
+The numbers can be shown in an overlay (``BaseLogic.debug_overlay``) and written to a
+JSON file with p50/p99 per phase.
+
+A disabled profiler only costs the method call: ``start`` returns 0 and ``stop`` and
+``count`` return immediately. The engine and the score store are only wrapped when
+the profiler is enabled, so they run untouched otherwise.
+"""
+import json
+import math
+import time
+from typing import Dict, Iterable, List
+
+import src.engine as engine
+
+BUCKETS_PER_OCTAVE = 8  # histogram resolution: about 9 % per bucket
+ENGINE_PHASES = {"_move": "engine.move", "_resolve_collisions": "engine.collisions", "spawn_food": "engine.spawn_food"}
+
+
+class Histogram:
+    """Durations in log-scaled buckets, so memory stays constant however long the game runs."""
+    __slots__ = ("buckets", "count", "total", "max", "last")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = int(math.log2(seconds * 1e9) * BUCKETS_PER_OCTAVE) if seconds > 1e-9 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the ``p`` quantile (0 <= p <= 1), in seconds."""
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1e9, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Profiler:
+    """Phase timers and counters; usage: ``started = profiler.start(); ...; profiler.stop("draw", started)``."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._frame_start: Dict[str, int] = {}  # counters at the start of the current frame
+        self.frame_counters: Dict[str, int] = {}  # what the last finished frame added to each counter
+
+    def start(self) -> float:
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, phase: str, started: float) -> None:
+        if not self.enabled:
+            return
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        histogram.record(time.perf_counter() - started)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def end_frame(self) -> None:
+        """Marks a frame boundary; the overlay shows the counters per frame."""
+        if self.enabled:
+            start = self._frame_start
+            self.frame_counters = {name: value - start.get(name, 0) for name, value in self.counters.items()}
+            self._frame_start = dict(self.counters)
+
+    def timed(self, phase: str, function):
+        """Wraps ``function`` so that every call is recorded as ``phase``."""
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.stop(phase, started)
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def instrument_engine(self) -> None:
+        """Times the phases of ``engine.step`` and counts food spawns that found the board full."""
+        if not self.enabled or hasattr(engine._move, "__wrapped__"):
+            return
+        for name, phase in ENGINE_PHASES.items():
+            setattr(engine, name, self.timed(phase, getattr(engine, name)))
+        spawn = engine.spawn_food
+
+        def spawn_food(state):
+            placed = spawn(state)
+            if not placed:
+                self.count("board_full")
+            return placed
+        spawn_food.__wrapped__ = spawn
+        engine.spawn_food = spawn_food
+
+    def instrument(self, obj, methods: Iterable[str], prefix: str) -> None:
+        """Times the given methods of one object (e.g. the score store) as ``prefix.method``."""
+        if not self.enabled:
+            return
+        for name in methods:
+            setattr(obj, name, self.timed(f"{prefix}.{name}", getattr(obj, name)))
+
+    def summary(self) -> Dict[str, dict]:
+        return {
+            "phases": {phase: histogram.summary() for phase, histogram in sorted(self.phases.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def overlay_lines(self) -> List[str]:
+        """Text for the debug overlay: last / p99 per phase in ms, counters of the last frame."""
+        lines = []
+        frame = self.phases.get("frame")
+        if frame is not None and frame.last:
+            lines.append(f"{1 / frame.last:5.0f} fps")
+        for phase, histogram in sorted(self.phases.items()):
+            lines.append(f"{phase:<20}{histogram.last * 1000:7.2f}{histogram.percentile(0.99) * 1000:7.2f}")
+        for counter, value in sorted(self.frame_counters.items()):
+            lines.append(f"{counter:<20}{value:7d}")
+        return lines
+
@@ -1,8 +1,14 @@
 import pygame
-import sys
 import time
-import random
-from typing import List, Tuple, Optional
+from abc import ABC, abstractmethod
+from typing import Deque, List, Tuple, Optional
+from src.bots import Controller
+from src.camera import Camera, ChunkCache, chunks_in_view
+from src.engine import FOOD, GameState, step
+from src.fonts import get_font, render_text
+from src.instrumentation import Profiler
+from src.palette import blit_cells, make_palette
+from src.replay import Replay
 
 # Constants (Consider moving these to a separate constants.py file)
 COLORS = { "BLACK": (0, 0, 0),
@@ -18,11 +24,34 @@ COLORS = { "BLACK": (0, 0, 0),
 FONT_NAME = "arial"
 FONT_SIZE_SCORE = 30
 FONT_SIZE_GAME_OVER = 50
+FONT_SIZE_OVERLAY = 14
+INPUT_BUFFER_SIZE = 3  # turns a player can queue ahead of the simulation
+BATCH_CELLS = 500  # from this many changed cells on, the whole board is drawn in one batch
 
-class BaseLogic:
+class BaseLogic(ABC):
+    """
+    Pygame front end around a headless :class:`GameState`; subclasses create the state and map keys.
+
+    Key presses are queued per snake and one queued turn is applied per simulation tick,
+    so two quick presses within one tick (e.g. UP, LEFT for a U-turn) are both executed.
+    Snakes with an entry in ``controllers`` are steered by that bot instead.
+
+    Drawing is incremental: after the first full frame only the cells the engine wrote
+    since the last frame (and the score bar, if a score changed) are repainted and passed
+    to a single ``pygame.display.update(rects)``.
+
+    Boards larger than the window (``board_size``) are shown through a :class:`Camera`
+    that follows snake ``camera_target``, drawn from cached chunk surfaces. Smaller
+    boards (or axes) are centered, with the area around them in the score bar's gray so
+    that their edges are visible.
+
+    ``profiler`` counts the cells drawn per frame; with ``debug_overlay`` its numbers are
+    drawn over the top left corner of the board every frame.
+    """
     DEFAULT_COLORS = (COLORS["BLACK"], COLORS["RED"], COLORS["MAGENTA"], COLORS["BLUE"], COLORS["WHITE"])
 
-    def __init__(self, game_window: pygame.Surface, fps_controller: pygame.time.Clock, window_width: int, window_height: int):
+    def __init__(self, game_window: pygame.Surface, fps_controller: pygame.time.Clock, window_width: int, window_height: int,
+                 board_size: Optional[Tuple[int, int]] = None):
         self.game_window = game_window
         self.fps_controller = fps_controller
         self.window_width = window_width
@@ -30,43 +59,182 @@ class BaseLogic:
         self.border_height = 50
         self.block_size = 10
         self.playable_height = self.window_height - self.border_height
-        self.score = 0
-        self.food_pos = [] # initialize as list to handle multiple food items
-
-    def spawn_food(self, snake_bodies: List[List[List[int]]], num_food_items: int = 2) -> None:
-        """Generates new food positions that are not in any of the snakes' bodies."""
-
-        self.food_pos = [] # clear food positions
-        while len(self.food_pos) < num_food_items:  # Use num_food_items
-            new_food_pos = [
-                random.randrange(0, self.window_width // self.block_size) * self.block_size,
-                random.randrange(self.border_height // self.block_size,
-                                 self.window_height // self.block_size) * self.block_size
-            ]
-            if all(new_food_pos not in body for body in snake_bodies) and new_food_pos not in self.food_pos:
-                self.food_pos.append(new_food_pos)
+        self.view_width = self.window_width // self.block_size
+        self.view_height = self.playable_height // self.block_size
+        self.board_width, self.board_height = board_size or (self.view_width, self.view_height)
+        self.state: Optional[GameState] = None
+        self.replay: Optional[Replay] = None  # recording of the inputs, set up by subclasses
+        self.change_to: List[Deque[str]] = []
+        self.controllers: List[Optional[Controller]] = []  # computer player per snake, None for humans
+        self.full_redraw = True
+        self._drawn_scores: Optional[Tuple[Tuple[int, bool], ...]] = None
+        self.board_origin = (0, self.border_height)  # pixel position of the top left cell, set on full redraws
+        self.camera_target = 0  # snake the camera follows on large boards
+        self.camera: Optional[Camera] = None
+        self.chunks: Optional[ChunkCache] = None
+        self.profiler = Profiler()  # disabled unless the caller passes its own
+        self.debug_overlay = False
+        self._overlay_box = pygame.Rect(0, self.border_height, 0, 0)
+
+    @property
+    def score(self) -> int:
+        return self.state.snakes[0].score
+
+    @property
+    def game_over_flag(self) -> bool:
+        return self.state.game_over
+
+    def queue_direction(self, snake_index: int, direction: str) -> None:
+        """Buffers a turn for the next free tick; repeats of the last queued direction are ignored."""
+        queue = self.change_to[snake_index]
+        last = queue[-1] if queue else self.state.snakes[snake_index].direction
+        if direction != last and len(queue) < INPUT_BUFFER_SIZE:
+            queue.append(direction)
+
+    def update(self) -> None:
+        """Advances the simulation by one tick, consuming at most one queued turn per snake."""
+        actions = [queue.popleft() if queue else None for queue in self.change_to]
+        for snake_index, controller in enumerate(self.controllers):
+            if controller is not None and self.state.snakes[snake_index].alive:
+                actions[snake_index] = controller(self.state, snake_index)
+        if self.replay is not None:
+            self.replay.record(self.state, actions)
+        step(self.state, actions)
+
+    def cell_rect(self, cell: int) -> pygame.Rect:
+        """Converts a packed board cell into its pixel rectangle below the score bar."""
+        y, x = divmod(cell, self.board_width)
+        left, top = self.board_origin
+        return pygame.Rect(left + x * self.block_size, top + y * self.block_size, self.block_size, self.block_size)
 
     def draw_border_and_score(self) -> None:
         pygame.draw.rect(self.game_window, COLORS["GRAY"], (0, 0, self.window_width, self.border_height))
-        font = pygame.font.SysFont(FONT_NAME, FONT_SIZE_SCORE)
-        score_surface = font.render(f"Score: {self.score}", True, COLORS["WHITE"]) # placeholder, will be overwritten
+        font = get_font(FONT_NAME, FONT_SIZE_SCORE)
+        score_surface = render_text(font, f"Score: {self.score}", COLORS["WHITE"]) # placeholder, will be overwritten
         self.game_window.blit(score_surface, (10, 10))
 
+    @abstractmethod
+    def snake_colors(self, colors: Tuple[Tuple[int, int, int], ...]) -> Tuple[Tuple[int, int, int], ...]:
+        """Color per snake, in the order of ``state.snakes``."""
+
     def draw_elements(self, colors: Optional[Tuple[Tuple[int, int, int], ...]] = None) -> None:
         if colors is None:
             colors = self.DEFAULT_COLORS
         black, red, magenta, blue, white = colors
+        cell_colors = (black,) + self.snake_colors(colors)
+
+        if self.full_redraw:
+            self.state.changed = set()
+            bs = self.block_size
+            self.board_origin = (max(self.window_width - self.state.width * bs, 0) // 2,
+                                 self.border_height + max(self.playable_height - self.state.height * bs, 0) // 2)
+            # the board is drawn over this; what stays gray is outside a board smaller than the window
+            self.game_window.fill(COLORS["GRAY"], (0, self.border_height, self.window_width, self.playable_height))
+        if self.state.width > self.view_width or self.state.height > self.view_height:
+            dirty_rects = self._draw_view(cell_colors, magenta)
+        else:
+            dirty_rects = self._draw_board(cell_colors, magenta)
+        if self.full_redraw:
+            dirty_rects = [pygame.Rect(0, 0, self.window_width, self.window_height)]
+        self.state.changed.clear()
+
+        scores = tuple((snake.score, snake.alive) for snake in self.state.snakes)
+        if self.full_redraw or scores != self._drawn_scores:
+            self.draw_border_and_score() # draw border and score
+            self._drawn_scores = scores
+            dirty_rects.append(pygame.Rect(0, 0, self.window_width, self.border_height))
+
+        if self.debug_overlay:
+            dirty_rects.append(self.draw_overlay())
+
+        self.full_redraw = False
+        pygame.display.update(dirty_rects)
+
+    def _draw_board(self, cell_colors: Tuple[Tuple[int, int, int], ...], food_color: Tuple[int, int, int]) -> List[pygame.Rect]:
+        """
+        Draws the changed cells of a board that fits into the window. After a full redraw
+        or when many cells changed (e.g. a long snake died) the whole grid is drawn in one
+        batch instead, see :func:`blit_cells`.
+        """
+        state = self.state
+        if self.full_redraw or len(state.changed) >= BATCH_CELLS:
+            self.profiler.count("cells_drawn", len(state.grid))
+            return [blit_cells(self.game_window, state.grid, state.width, state.height,
+                               make_palette(cell_colors, food_color), self.block_size, self.board_origin)]
+        dirty_rects = []
+        for cell in state.changed:
+            value = state.grid[cell]
+            rect = self.cell_rect(cell)
+            pygame.draw.rect(self.game_window, food_color if value == FOOD else cell_colors[value], rect)
+            dirty_rects.append(rect)
+        self.profiler.count("cells_drawn", len(dirty_rects))
+        return dirty_rects
+
+    def _draw_view(self, cell_colors: Tuple[Tuple[int, int, int], ...], food_color: Tuple[int, int, int]) -> List[pygame.Rect]:
+        """
+        Draws the camera's view of a large board. Changed cells are painted into their
+        cached chunk; if the camera moved, the visible chunks are blitted, otherwise only
+        the changed cells inside the view are drawn.
+        """
+        state = self.state
+        if self.full_redraw or self.chunks is None or self.chunks.state is not state:
+            palette = make_palette(cell_colors, food_color)
+            self.camera = Camera(state.width, state.height, self.view_width, self.view_height, state.wrap)
+            self.chunks = ChunkCache(state, self.block_size, palette, 2 * chunks_in_view(self.view_width, self.view_height))
+            if state.snakes[self.camera_target].alive:
+                self.camera.center(state.snakes[self.camera_target].head)
+            moved = True
+        else:
+            target = state.snakes[self.camera_target]
+            moved = target.alive and self.camera.follow(target.head)
+
+        if len(state.changed) >= BATCH_CELLS:
+            self.chunks.clear()  # re-rendering the visible chunks is cheaper than painting each cell
+            moved = True
+        else:
+            for cell in state.changed:
+                self.chunks.paint(cell)
+        if moved:
+            self.chunks.blit_view(self.game_window, self.camera, self.board_origin)
+            self.profiler.count("cells_drawn", self.view_width * self.view_height)
+            return [pygame.Rect(0, self.border_height, self.window_width, self.playable_height)]
+
+        dirty_rects = []
+        palette = self.chunks.palette
+        left, top = self.board_origin
+        for cell in state.changed:
+            position = self.camera.to_view(cell)
+            if position is not None:
+                rect = pygame.Rect(left + position[0] * self.block_size, top + position[1] * self.block_size,
+                                   self.block_size, self.block_size)
+                self.game_window.fill(palette[state.grid[cell]], rect)
+                dirty_rects.append(rect)
+        self.profiler.count("cells_drawn", len(dirty_rects))
+        return dirty_rects
 
-        self.game_window.fill(black, (0, self.border_height, self.window_width, self.playable_height)) # fill the playable area
-        self.draw_border_and_score() # draw border and score
+    def draw_overlay(self) -> pygame.Rect:
+        """Draws the profiler numbers in a box over the board and returns the box."""
+        font = get_font(FONT_NAME, FONT_SIZE_OVERLAY)
+        # not via render_text: the numbers change every frame and would flush its cache
+        surfaces = [font.render(line, True, COLORS["WHITE"]) for line in self.profiler.overlay_lines()]
+        width = max((surface.get_width() for surface in surfaces), default=0) + 10
+        height = sum(surface.get_height() for surface in surfaces) + 10
+        # never shrink, so no stale edge of a wider box is left on the board
+        box = self._overlay_box = self._overlay_box.union((0, self.border_height, width, height))
+        self.game_window.fill(COLORS["GRAY"], box)
+        y = box.y + 5
+        for surface in surfaces:
+            self.game_window.blit(surface, (5, y))
+            y += surface.get_height()
+        return box
 
     def game_over(self, colors: Optional[Tuple[Tuple[int, int, int], ...]] = None) -> int:
         if colors is None:
             colors = self.DEFAULT_COLORS
         black, red, magenta, blue, white = colors
 
-        font = pygame.font.SysFont(FONT_NAME, FONT_SIZE_GAME_OVER)
-        game_over_surface = font.render('Game Over', True, red)
+        font = get_font(FONT_NAME, FONT_SIZE_GAME_OVER)
+        game_over_surface = render_text(font, 'Game Over', red)
         game_over_rect = game_over_surface.get_rect()
         game_over_rect.midtop = (self.window_width // 2, self.window_height // 4)
         self.game_window.fill(black)
@@ -74,4 +242,4 @@ class BaseLogic:
         self.draw_border_and_score()
         pygame.display.flip()
         time.sleep(1)
-        return self.score
\ No newline at end of file
+        return self.score
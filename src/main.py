@@ -1,22 +1,41 @@
+import argparse
+import os
 import pygame
 import sys
+from datetime import datetime
 from typing import Optional, List, Tuple
 from logic import BaseLogic, COLORS
 from singleplayer import SingleplayerLogic
 from multiplayer import MultiplayerLogic
-from db_score import DBScore
+from network import NetworkLogic
+from viewer import ViewerLogic
+from spectator import SpectatorFeed
+from bots import pathfinding_bot
+from score_store import create_score_store
+from score_writer import ScoreWriter
+from highscore_cache import HighscoreCache
+from fonts import get_font, render_text
+from instrumentation import Profiler
+from timestep import FixedTimestep
 
 # Constants (Consider moving these to a separate constants.py file)
 WINDOW_WIDTH = 800
 BORDER_HEIGHT = 50
 GAME_HEIGHT = 800
 WINDOW_HEIGHT = GAME_HEIGHT + BORDER_HEIGHT
+TICK_RATE = 30  # simulation ticks per second, independent of the render rate
+RENDER_FPS = 60
 COLORS = COLORS
 
+REPLAY_DIR = os.path.join(os.path.dirname(__file__), "..", "replays")
+
 FONT_NAME = "arial"
 FONT_SIZE_TITLE = 50
 FONT_SIZE_OPTION = 30
 FONT_SIZE_INPUT = 30
+PARTY_PLAYERS = 8  # two humans, the rest are computer players
+MIN_BOARD = 16  # cells per side; the party rows need some room
+MAX_BOARD = 1000
 
 def get_player_name(game_window: pygame.Surface, fps_controller: pygame.time.Clock, window_width: int,
                     player_num: Optional[int] = None) -> str:
@@ -28,7 +47,7 @@ def get_player_name(game_window: pygame.Surface, fps_controller: pygame.time.Clo
     :param window_width: Die Breite des Fensters.
     :return: Der eingegebene Name als String.
     """
-    font = pygame.font.SysFont(FONT_NAME, FONT_SIZE_INPUT)
+    font = get_font(FONT_NAME, FONT_SIZE_INPUT)
     input_box = pygame.Rect(window_width // 2 - 100, 400, 200, 40)
     color_inactive = COLORS["LIGHT_SKY_BLUE"]
     color_active = COLORS["DODGER_BLUE"]
@@ -60,15 +79,15 @@ def get_player_name(game_window: pygame.Surface, fps_controller: pygame.time.Clo
 
         game_window.fill(COLORS["BLACK"])
 
-        txt_surface = font.render(text, True, color)
+        txt_surface = render_text(font, text, color)
         input_box.w = max(200, txt_surface.get_width() + 10)
         game_window.blit(txt_surface, (input_box.x + 5, input_box.y + 5))
         pygame.draw.rect(game_window, color, input_box, 2)
 
         if player_num:
-            instruction = font.render(f"Player {player_num}, Name:", True, COLORS["WHITE"])
+            instruction = render_text(font, f"Player {player_num}, Name:", COLORS["WHITE"])
         else:
-            instruction = font.render("Name eingeben:", True, COLORS["WHITE"])
+            instruction = render_text(font, "Name eingeben:", COLORS["WHITE"])
         game_window.blit(instruction, (window_width // 2 - instruction.get_width() // 2, input_box.y - 40))
 
         pygame.display.flip()
@@ -85,30 +104,48 @@ def get_two_player_names(game_window: pygame.Surface, fps_controller: pygame.tim
     return player1_name, player2_name
 
 
-def show_highscore(game_window: pygame.Surface, fps_controller: pygame.time.Clock, db: DBScore) -> None:
+def save_replay(game: BaseLogic, player_name: str, score: int) -> None:
+    """
+    Speichert die Aufzeichnung eines Spiels zusammen mit dem eingereichten Score,
+    damit er später mit ``python -m src.replay`` nachgeprüft werden kann.
+
+    :param game: Das beendete Spiel.
+    :param player_name: Name des Spielers.
+    :param score: Eingereichter Score.
+    """
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    safe_name = "".join(char if char.isalnum() else "_" for char in player_name)
+    file_name = f"{datetime.now():%Y%m%d-%H%M%S}_{safe_name}_{score}.snr"
+    try:
+        game.replay.save(os.path.join(REPLAY_DIR, file_name))
+    except OSError as err:
+        print(f"⚠ Replay konnte nicht gespeichert werden: {err}")
+
+
+def show_highscore(game_window: pygame.Surface, fps_controller: pygame.time.Clock, highscores: HighscoreCache) -> None:
     """
-    Zeigt die Top 10 Highscores an.
+    Zeigt die Top 10 der Bestenliste (bester Score pro Spieler) aus dem lokalen Cache an, der im Hintergrund aktualisiert wird.
 
     :param game_window: Das Pygame-Fenster, auf dem gezeichnet wird.
     :param fps_controller: Der Pygame-FPS-Controller.
-    :param db: Die Datenbankverbindung für die Highscores.
+    :param highscores: Der Highscore-Cache.
     """
-    scores = db.get_top_scores()
-    font_title = pygame.font.SysFont(FONT_NAME, FONT_SIZE_TITLE)
-    font_item = pygame.font.SysFont(FONT_NAME, FONT_SIZE_OPTION)
+    scores = highscores.get()
+    font_title = get_font(FONT_NAME, FONT_SIZE_TITLE)
+    font_item = get_font(FONT_NAME, FONT_SIZE_OPTION)
     game_window.fill(COLORS["BLACK"])
-    title = font_title.render("Highscore", True, COLORS["WHITE"])
+    title = render_text(font_title, "Highscore", COLORS["WHITE"])
     game_window.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 50))
     y = 120
     if scores:
         for i, (player, score_val, achieved_at) in enumerate(scores, start=1):
-            text_surface = font_item.render(f"{i}. {player} - {score_val} ({achieved_at})", True, COLORS["WHITE"])
+            text_surface = render_text(font_item, f"{i}. {player} - {score_val} ({achieved_at})", COLORS["WHITE"])
             game_window.blit(text_surface, (WINDOW_WIDTH // 2 - text_surface.get_width() // 2, y))
             y += 40
     else:
-        no_score = font_item.render("Keine Scores vorhanden", True, COLORS["WHITE"])
+        no_score = render_text(font_item, "Keine Scores vorhanden", COLORS["WHITE"])
         game_window.blit(no_score, (WINDOW_WIDTH // 2 - no_score.get_width() // 2, y))
-    instruction = font_item.render("Taste drücken", True, COLORS["WHITE"])
+    instruction = render_text(font_item, "Taste drücken", COLORS["WHITE"])
     game_window.blit(instruction, (WINDOW_WIDTH // 2 - instruction.get_width() // 2, y + 60))
     pygame.display.flip()
     while True:
@@ -121,29 +158,33 @@ def show_highscore(game_window: pygame.Surface, fps_controller: pygame.time.Cloc
         fps_controller.tick(30)
 
 
-def show_menu(game_window: pygame.Surface, fps_controller: pygame.time.Clock, db: DBScore) -> str:
+def show_menu(game_window: pygame.Surface, fps_controller: pygame.time.Clock, highscores: HighscoreCache) -> str:
     """
     Zeigt das Hauptmenü mit den Optionen an.
 
     :param game_window: Das Pygame-Fenster, auf dem gezeichnet wird.
     :param fps_controller: Der Pygame-FPS-Controller.
-    :param db: Die Datenbankverbindung für die Highscores.
+    :param highscores: Der Highscore-Cache.
     :return: Die ausgewählte Option als String.
     """
-    font_title = pygame.font.SysFont(FONT_NAME, FONT_SIZE_TITLE)
-    font_option = pygame.font.SysFont(FONT_NAME, FONT_SIZE_OPTION)
+    font_title = get_font(FONT_NAME, FONT_SIZE_TITLE)
+    font_option = get_font(FONT_NAME, FONT_SIZE_OPTION)
     while True:
         game_window.fill(COLORS["BLACK"])
-        title_surface = font_title.render("Snake Game", True, COLORS["WHITE"])
-        option1 = font_option.render("1. Singleplayer", True, COLORS["WHITE"])
-        option2 = font_option.render("2. Multiplayer", True, COLORS["WHITE"])
-        option3 = font_option.render("3. Highscore", True, COLORS["WHITE"])
-        option4 = font_option.render("4. Beenden", True, COLORS["WHITE"])
+        title_surface = render_text(font_title, "Snake Game", COLORS["WHITE"])
+        option1 = render_text(font_option, "1. Singleplayer", COLORS["WHITE"])
+        option2 = render_text(font_option, "2. Multiplayer", COLORS["WHITE"])
+        option3 = render_text(font_option, "3. Computer", COLORS["WHITE"])
+        option4 = render_text(font_option, "4. Party", COLORS["WHITE"])
+        option5 = render_text(font_option, "5. Highscore", COLORS["WHITE"])
+        option6 = render_text(font_option, "6. Beenden", COLORS["WHITE"])
         game_window.blit(title_surface, (WINDOW_WIDTH // 2 - title_surface.get_width() // 2, 100))
         game_window.blit(option1, (WINDOW_WIDTH // 2 - option1.get_width() // 2, 200))
         game_window.blit(option2, (WINDOW_WIDTH // 2 - option2.get_width() // 2, 250))
         game_window.blit(option3, (WINDOW_WIDTH // 2 - option3.get_width() // 2, 300))
         game_window.blit(option4, (WINDOW_WIDTH // 2 - option4.get_width() // 2, 350))
+        game_window.blit(option5, (WINDOW_WIDTH // 2 - option5.get_width() // 2, 400))
+        game_window.blit(option6, (WINDOW_WIDTH // 2 - option6.get_width() // 2, 450))
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -155,69 +196,214 @@ def show_menu(game_window: pygame.Surface, fps_controller: pygame.time.Clock, db
                     player1_name, player2_name = get_two_player_names(game_window, fps_controller, WINDOW_WIDTH)
                     return "multiplayer", player1_name, player2_name
                 elif event.key == pygame.K_3:
-                    result = show_highscore(game_window, fps_controller, db)  # Capture the result
+                    return "computer"
+                elif event.key == pygame.K_4:
+                    player1_name, player2_name = get_two_player_names(game_window, fps_controller, WINDOW_WIDTH)
+                    return "party", player1_name, player2_name
+                elif event.key == pygame.K_5:
+                    result = show_highscore(game_window, fps_controller, highscores)  # Capture the result
                     if result == "quit":  # Check if quit from highscore screen
                         return "quit"
-                elif event.key == pygame.K_4:
+                elif event.key == pygame.K_6:
                     return "quit"
         fps_controller.tick(30)
 
 
-def main() -> None:
+def run_game(game: BaseLogic, fps_controller: pygame.time.Clock, profiler: Optional[Profiler] = None,
+             overlay: bool = False) -> int:
+    """
+    Spielt ein Spiel bis zum Ende: Eingaben, feste Simulationsschritte und Zeichnen.
+
+    :param game: Das Spiel.
+    :param fps_controller: Der Pygame-FPS-Controller.
+    :param profiler: Misst die Phasen jedes Frames (optional).
+    :param overlay: Zeigt die Messwerte im Spiel an.
+    :return: Der Score aus ``game.game_over()`` (0 bei Multiplayer- und Online-Spielen).
+    """
+    if profiler is None:
+        profiler = Profiler()
+    game.profiler = profiler
+    game.debug_overlay = overlay
+    timestep = FixedTimestep(TICK_RATE)
+    while True:
+        frame_started = started = profiler.start()
+        game.process_events()
+        profiler.stop("events", started)
+        for _ in range(timestep.advance()):
+            started = profiler.start()
+            game.update()
+            profiler.stop("update", started)
+            profiler.count("ticks")
+            if game.game_over_flag:
+                break
+
+        if game.game_over_flag:
+            return game.game_over()
+        started = profiler.start()
+        game.draw_elements()  # presents only the changed cells
+        profiler.stop("draw", started)
+        fps_controller.tick(RENDER_FPS)
+        profiler.stop("frame", frame_started)
+        profiler.end_frame()
+
+
+def play_online(address: str, room: str, player_name: Optional[str], profiler: Profiler, overlay: bool) -> None:
+    """
+    Tritt einem Raum auf dem Spielserver bei (``python -m src.server``) und spielt dort eine Runde.
+
+    :param address: Adresse des Servers als HOST:PORT.
+    :param room: Name des Raums.
+    :param player_name: Name des Spielers, ohne Namen wird er abgefragt.
+    :param profiler: Misst die Phasen jedes Frames.
+    :param overlay: Zeigt die Messwerte im Spiel an.
+    """
+    host, _, port = address.rpartition(":")
     pygame.init()
     game_window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Snake Game")
     fps_controller = pygame.time.Clock()
-    db = DBScore()
+    if not player_name:
+        player_name = get_player_name(game_window, fps_controller, WINDOW_WIDTH)
+    try:
+        game = NetworkLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT, host, int(port), room, player_name)
+    except (OSError, ValueError) as err:
+        print(f"⚠ Keine Verbindung zu {address}: {err}")
+        return
+    run_game(game, fps_controller, profiler, overlay)
 
-    while True:
-        selection = show_menu(game_window, fps_controller, db)
 
-        if selection == "quit":
-            break
+def watch(address: str, profiler: Profiler, overlay: bool) -> None:
+    """
+    Zeigt die Spiele eines Zuschauer-Feeds (``--spectate``) an, bis die Verbindung endet.
 
-        if isinstance(selection, tuple):
-            mode, player1_name, player2_name = selection
-            if mode == "multiplayer":
-                game = MultiplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT, player1_name, player2_name)
+    :param address: Adresse des Feeds als HOST:PORT.
+    :param profiler: Misst die Phasen jedes Frames.
+    :param overlay: Zeigt die Messwerte im Spiel an.
+    """
+    host, _, port = address.rpartition(":")
+    pygame.init()
+    game_window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Snake Game - Zuschauer")
+    fps_controller = pygame.time.Clock()
+    try:
+        game = ViewerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT, host or "127.0.0.1", int(port))
+    except (OSError, ValueError) as err:
+        print(f"⚠ Keine Verbindung zu {address}: {err}")
+        return
+    run_game(game, fps_controller, profiler, overlay)
+
+
+def board_size(text: str) -> Tuple[int, int]:
+    """
+    Liest eine Spielfeldgröße wie ``400x300`` (Breite x Höhe in Zellen).
+
+    :param text: Die Größe als Text.
+    :return: (Breite, Höhe)
+    :raises argparse.ArgumentTypeError: Wenn die Größe ungültig ist.
+    """
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Spielfeldgröße: {text} (erwartet z.B. 400x300)")
+    if not (MIN_BOARD <= width <= MAX_BOARD and MIN_BOARD <= height <= MAX_BOARD):
+        raise argparse.ArgumentTypeError(f"Breite und Höhe müssen zwischen {MIN_BOARD} und {MAX_BOARD} liegen")
+    return width, height
+
+
+def play_local(profiler: Profiler, overlay: bool, board: Optional[Tuple[int, int]] = None,
+               spectate: Optional[str] = None) -> None:
+    """
+    Hauptmenü und lokale Spiele bis zum Beenden.
+
+    :param profiler: Misst die Phasen jedes Frames und die Aufrufe des Score-Speichers.
+    :param overlay: Zeigt die Messwerte im Spiel an.
+    :param board: Spielfeldgröße in Zellen, ohne Angabe so groß wie das Fenster.
+    :param spectate: [HOST:]PORT, auf dem Zuschauer die Multiplayer- und Party-Spiele verfolgen können.
+    """
+    spectators = None
+    if spectate:
+        host, _, port = spectate.rpartition(":")
+        spectators = SpectatorFeed(host or "127.0.0.1", int(port), TICK_RATE)
+        print(f"Zuschauer-Feed auf {spectators.address[0]}:{spectators.address[1]}")
+    pygame.init()
+    game_window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Snake Game")
+    fps_controller = pygame.time.Clock()
+    db = create_score_store()  # backend from SCORE_BACKEND in config.json
+    profiler.instrument(db, ("insert_scores", "get_leaderboard"), "db")
+    highscores = HighscoreCache(db.get_leaderboard)  # best score per player, read via index
+    highscores.refresh()
+    score_writer = ScoreWriter(db, on_written=highscores.record)
+
+    try:
+        while True:
+            selection = show_menu(game_window, fps_controller, highscores)
+
+            if selection == "quit":
+                break
+
+            if isinstance(selection, tuple):
+                mode, player1_name, player2_name = selection
+                if mode == "multiplayer":
+                    game = MultiplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT,
+                                            [player1_name, player2_name], board_size=board,
+                                            spectators=spectators)
+                elif mode == "party":
+                    bots = PARTY_PLAYERS - 2
+                    names = [player1_name, player2_name] + [f"Bot {i}" for i in range(3, PARTY_PLAYERS + 1)]
+                    game = MultiplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT, names,
+                                            [None, None] + [pathfinding_bot] * bots, party=True, board_size=board,
+                                            spectators=spectators)
+                else:
+                    continue
+
+            elif selection == "singleplayer":
+                game = SingleplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT, board_size=board)
+            elif selection == "computer":
+                game = SingleplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT,
+                                         controller=pathfinding_bot, board_size=board)
             else:
                 continue
 
-        elif selection == "singleplayer":
-            game = SingleplayerLogic(game_window, fps_controller, WINDOW_WIDTH, WINDOW_HEIGHT)
-        else:
-            continue
+            final_score = run_game(game, fps_controller, profiler, overlay)  # Multiplayer returns 0, so only singleplayer scores are stored
+            if final_score > 0 and selection != "computer":  # bot games stay out of the highscores
+                player_name = get_player_name(game_window, fps_controller, WINDOW_WIDTH)
+                score_writer.submit(player_name, final_score)  # never blocks on the network
+                save_replay(game, player_name, final_score)
+    finally:
+        score_writer.close()  # spills unwritten scores to the journal
+        db.close()
+        if spectators is not None:
+            spectators.close()
 
-        while True:
-            if isinstance(game, MultiplayerLogic):
-                game.process_events()
-                game.update_direction()
-                game.update_snake_position()
-                game.update_snake_body()
-                game.check_collisions()  # No longer returns a value
-
-                if game.game_over_flag:
-                    game.game_over()  # Multiplayer game_over handles its logic
-                    break
-                game.draw_elements()
-                pygame.display.flip()
-                fps_controller.tick(30)
-
-            elif isinstance(game, SingleplayerLogic):
-                game.process_events()
-                game.update_direction()
-                game.update_snake_position()
-                game.update_snake_body()
-
-                if game.check_collisions() or game.game_over_flag:
-                    final_score = game.game_over()
-                    if final_score > 0:
-                        player_name = get_player_name(game_window, fps_controller, WINDOW_WIDTH)
-                        db.insert_score(player_name, final_score)
-                    break
-                game.draw_elements()
-                pygame.display.flip()
-                fps_controller.tick(30)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="online auf einem Spielserver spielen")
+    parser.add_argument("--room", default="lobby", help="Raum auf dem Spielserver")
+    parser.add_argument("--name", help="Spielername für das Online-Spiel")
+    parser.add_argument("--spectate", metavar="[HOST:]PORT",
+                        help="lokale Multiplayer-Spiele für Zuschauer übertragen (HOST ohne Angabe 127.0.0.1)")
+    parser.add_argument("--watch", metavar="HOST:PORT", help="einem Zuschauer-Feed zusehen")
+    parser.add_argument("--board", type=board_size, metavar="BxH",
+                        help="Spielfeldgröße in Zellen, größere Felder scrollen mit der Schlange")
+    parser.add_argument("--overlay", action="store_true", help="Messwerte pro Phase im Spiel anzeigen")
+    parser.add_argument("--profile", metavar="DATEI", help="p50/p99 pro Phase beim Beenden als JSON speichern")
+    args = parser.parse_args()
+    profiler = Profiler(enabled=bool(args.overlay or args.profile))
+    profiler.instrument_engine()
+    try:
+        if args.connect:
+            play_online(args.connect, args.room, args.name, profiler, args.overlay)
+            pygame.quit()
+        elif args.watch:
+            watch(args.watch, profiler, args.overlay)
+            pygame.quit()
+        else:
+            play_local(profiler, args.overlay, args.board, args.spectate)
+    finally:
+        if args.profile:
+            profiler.dump(args.profile)
 
 
 if __name__ == '__main__':
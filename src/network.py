@@ -0,0 +1,105 @@
+import pygame
+import sys
+from src.client import NetClient
+from src.logic import BaseLogic, COLORS, FONT_NAME, FONT_SIZE_SCORE
+from src.multiplayer import PlayerScoreBar
+from src.fonts import get_font, render_text
+
+KEYS = {
+    pygame.K_UP: "UP", pygame.K_DOWN: "DOWN", pygame.K_LEFT: "LEFT", pygame.K_RIGHT: "RIGHT",
+    pygame.K_w: "UP", pygame.K_s: "DOWN", pygame.K_a: "LEFT", pygame.K_d: "RIGHT",
+}
+
+
+class NetworkLogic(PlayerScoreBar, BaseLogic):
+    def __init__(self, game_window: pygame.Surface, fps_controller: pygame.time.Clock, window_width: int, window_height: int,
+                 host: str, port: int, room: str, player_name: str):
+        """
+        Plays in a room of the game server (``python -m src.server``).
+
+        The server runs the simulation; this class only sends key presses and draws its
+        copy of the state, which the client keeps up to date from the server's deltas.
+        """
+        super().__init__(game_window, fps_controller, window_width, window_height)
+        self.room = room
+        self.player_name = player_name
+        self.client = NetClient(host, port, room, player_name)
+
+    @property
+    def score(self) -> int:
+        return self.state.snakes[self.client.snake_index].score if self.state is not None else 0
+
+    @property
+    def game_over_flag(self) -> bool:
+        return self.client.game_over or not self.client.connected
+
+    def process_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.client.close()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key in KEYS and self.state is not None:
+                self.client.send_input(KEYS[event.key])
+        self.client.poll()
+        if self.state is not self.client.state:
+            self.state = self.client.state
+            self.board_width, self.board_height = self.state.width, self.state.height
+            self.camera_target = self.client.snake_index
+            self.full_redraw = True
+
+    def update(self) -> None:
+        """The server advances the game; deltas are applied in :meth:`process_events`."""
+
+    def draw_border_and_score(self) -> None:
+        pygame.draw.rect(self.game_window, COLORS["GRAY"], (0, 0, self.window_width, self.border_height))
+        font = get_font(FONT_NAME, FONT_SIZE_SCORE)
+        color = self.snake_colors(self.DEFAULT_COLORS)[self.client.snake_index]
+        score_surface = render_text(font, f"{self.player_name}: {self.score}", color)
+        self.game_window.blit(score_surface, (10, 10))
+
+        alive = sum(snake.alive for snake in self.state.snakes)
+        room_surface = render_text(font, f"{self.room}: {alive}/{len(self.state.snakes)}", COLORS["WHITE"])
+        room_rect = room_surface.get_rect()
+        room_rect.topright = (self.window_width - 10, 10)
+        self.game_window.blit(room_surface, room_rect)
+
+    def draw_elements(self, colors=None) -> None:
+        if self.state is None:
+            font = get_font(FONT_NAME, FONT_SIZE_SCORE)
+            self.game_window.fill(COLORS["BLACK"])
+            text = render_text(font, f"Waiting for players in {self.room}...", COLORS["WHITE"])
+            self.game_window.blit(text, text.get_rect(center=(self.window_width // 2, self.window_height // 2)))
+            pygame.display.flip()
+            return
+        super().draw_elements(colors)
+
+    def game_over(self) -> int:
+        """Shows the winner (or why the connection ended) and waits for a key."""
+        font = get_font(FONT_NAME, FONT_SIZE_SCORE * 2)
+        if self.client.error:
+            message = self.client.error
+        elif not self.client.game_over:
+            message = "Connection lost"
+        elif self.client.winner is None:
+            message = "Game Over! (Tie)"
+        elif self.client.winner == self.client.snake_index:
+            message = "You win!"
+        else:
+            message = f"Winner: Player {self.client.winner + 1}"
+        self.client.close()
+
+        text = render_text(font, message, COLORS["WHITE"])
+        self.game_window.fill(COLORS["BLACK"])
+        self.game_window.blit(text, text.get_rect(center=(self.window_width // 2, self.window_height // 2)))
+        if self.state is not None:
+            self.draw_border_and_score()
+        pygame.display.flip()
+
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    return 0  # online games are not stored in the highscores
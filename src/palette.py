@@ -0,0 +1,37 @@
+"""
+Batched drawing of board cells through an 8-bit palette.
+
+The occupancy grid already is an image with one byte per cell (EMPTY, a snake's owner
+id or FOOD). :func:`blit_cells` wraps those bytes as a palettized surface without
+copying, converts it to the target's pixel format and scales it up by the block size
+straight into the target, three C calls for any number of cells. Nearest-neighbour
+scaling gives exactly the pixels of one filled rectangle per cell.
+"""
+from typing import List, Sequence, Tuple
+
+import pygame
+
+from src.engine import FOOD
+
+Color = Tuple[int, int, int]
+
+
+def make_palette(cell_colors: Sequence[Color], food_color: Color) -> List[Color]:
+    """256 colors indexed by grid value: ``cell_colors[0]`` for empty cells, then one per snake, food at FOOD."""
+    palette = [cell_colors[0]] * 256
+    palette[1:len(cell_colors)] = cell_colors[1:]
+    palette[FOOD] = food_color
+    return palette
+
+
+def blit_cells(target: pygame.Surface, cells: bytes, width: int, height: int, palette: List[Color],
+               block_size: int, position: Tuple[int, int]) -> pygame.Rect:
+    """
+    Draws ``width`` x ``height`` grid values (row by row in ``cells``) at ``position`` of
+    ``target``, each as a ``block_size`` square, and returns the covered rectangle.
+    """
+    indexed = pygame.image.frombuffer(cells, (width, height), "P")
+    indexed.set_palette(palette)
+    rect = pygame.Rect(position, (width * block_size, height * block_size))
+    pygame.transform.scale(indexed.convert(target), rect.size, target.subsurface(rect))
+    return rect
@@ -0,0 +1,141 @@
+"""
+Client-side prediction of the own snake for networked play.
+
+The server applies an input only when it arrives, a network round trip after the key
+press, and the client sees the result only with the next delta. To hide that delay the
+client draws its own snake ``lead`` ticks ahead of the last server tick, steered by
+the inputs the server has not acknowledged yet. The other snakes stay where the server
+last saw them.
+
+The predicted moves are made directly on the client's copy of the state (so the
+incremental renderer sees them as ordinary cell writes) and recorded in an undo log.
+Before a server update is applied the prediction is rewound; afterwards it is replayed
+from the new authoritative tick with the inputs that are still pending. If the server
+applied an input at a different tick than predicted, the replay ends up somewhere
+else and the snake snaps onto the corrected path.
+"""
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.bots import neighbor
+from src.engine import EMPTY, FOOD, GameState
+
+MAX_LEAD = 15  # ticks; beyond that the prediction would be mostly wrong anyway
+LEAD_SAMPLES = 16
+
+
+class PendingInput:
+    """An input sent to the server and not acknowledged yet."""
+    __slots__ = ("seq", "direction", "tick", "sent_tick")
+
+    def __init__(self, seq: int, direction: str, tick: int, sent_tick: int):
+        self.seq = seq
+        self.direction = direction
+        self.tick = tick  # first predicted tick the input applies to
+        self.sent_tick = sent_tick  # last server tick known when it was sent
+
+
+class Prediction:
+    """
+    Runs snake ``snake_index`` of ``state`` ahead of the server.
+
+    ``lead`` is measured from the acknowledgements: the number of ticks between the
+    server tick known when an input was sent and the tick the server applied it. The
+    largest of the last LEAD_SAMPLES measurements is used, so jitter causes fewer
+    corrections at the price of running a little further ahead.
+    """
+
+    def __init__(self, state: GameState, snake_index: int, lead: Optional[int] = None):
+        self.state = state
+        self.snake_index = snake_index
+        self.fixed_lead = lead
+        self.lead = lead or 0
+        self.pending: Deque[PendingInput] = deque()
+        self.samples: Deque[int] = deque(maxlen=LEAD_SAMPLES)
+        # one entry per predicted tick: (head, dropped tail or None, eaten food slot or None, direction before)
+        self._log: List[Tuple[int, Optional[int], Optional[int], str]] = []
+        self._heads: Dict[int, int] = {}  # predicted tick -> head cell of the last replay
+        self.corrections = 0  # replays that moved an already drawn prediction
+
+    @property
+    def tick(self) -> int:
+        """The tick the own snake is shown at."""
+        return self.state.tick + len(self._log)
+
+    def wants(self, direction: str) -> bool:
+        """False for inputs the server would ignore: repeats of the last queued or current direction."""
+        last = self.pending[-1].direction if self.pending else self.state.snakes[self.snake_index].direction
+        return direction != last
+
+    def add(self, seq: int, direction: str) -> None:
+        """Records an input that was just sent; it applies from the next predicted tick on."""
+        tick = self.tick + 1
+        if self.pending:
+            tick = max(tick, self.pending[-1].tick + 1)  # the server applies one input per tick
+        self.pending.append(PendingInput(seq, direction, tick, self.state.tick))
+
+    def ack(self, seq: int) -> None:
+        """Drops the inputs the server has applied (or ignored) as of the current server tick."""
+        while self.pending and self.pending[0].seq <= seq:
+            sent = self.pending.popleft()
+            self.samples.append(max(self.state.tick - sent.sent_tick - 1, 0))
+        if self.fixed_lead is None and self.samples:
+            self.lead = min(max(self.samples), MAX_LEAD)
+
+    def rewind(self) -> None:
+        """Undoes all predicted moves, leaving the state as the server sent it."""
+        state = self.state
+        snake = state.snakes[self.snake_index]
+        owner = self.snake_index + 1
+        for head, tail, slot, direction in reversed(self._log):
+            snake.body.pop_head()
+            if slot is None:
+                state.set_cell(head, EMPTY)
+            else:
+                state.set_cell(head, FOOD)
+                state.food[slot] = head
+                snake.score -= 1
+            if tail is not None:
+                snake.body.push_tail(tail)
+                state.set_cell(tail, owner)
+            snake.direction = direction
+        self._log.clear()
+
+    def replay(self) -> None:
+        """Predicts the own snake from the server tick up to ``lead`` ticks ahead."""
+        state = self.state
+        snake = state.snakes[self.snake_index]
+        if state.game_over or not snake.alive:
+            return
+        drawn = self._heads
+        corrected = drawn.get(state.tick, snake.head) != snake.head
+        owner = self.snake_index + 1
+        pending = iter(self.pending)
+        next_input = next(pending, None)
+        heads = {}
+        for tick in range(state.tick + 1, state.tick + self.lead + 1):
+            direction = snake.direction
+            if next_input is not None and next_input.tick <= tick:
+                snake.turn(next_input.direction)
+                next_input = next(pending, None)
+            head = neighbor(state, snake.head, snake.direction)
+            value = EMPTY if head is None else state.grid[head]
+            if head is None or value not in (EMPTY, FOOD) and not (value == owner and head == snake.body.tail):
+                snake.direction = direction
+                break  # a crash; whether it really happens is up to the server
+            if value == FOOD:
+                slot = state.food.index(head)
+                state.food[slot] = None
+                snake.score += 1
+                tail = None
+            else:
+                slot = None
+                tail = snake.body.pop_tail()
+                state.set_cell(tail, EMPTY)
+            snake.body.push_head(head)
+            state.set_cell(head, owner)
+            self._log.append((head, tail, slot, direction))
+            heads[tick] = head
+        if corrected or any(drawn.get(tick, head) != head for tick, head in heads.items()):
+            self.corrections += 1
+        self._heads = heads
@@ -0,0 +1,446 @@
+"""
+Binary protocol between the game server (:mod:`src.server`) and its clients.
+
+Every message is one frame: payload length (u32, big endian), message type (u8),
+payload. Integers in payloads are unsigned LEB128 varints as in replay files, cells
+are packed (``y * width + x``) and strings are a varint length plus UTF-8.
+
+Client -> server::
+
+    JOIN       room, player name
+    INPUT      seq, direction code
+
+Server -> client::
+
+    WELCOME    snake index, players, width, height, flags (1 = wrap, 2 = last snake wins),
+               food slots, tick rate, then a SNAPSHOT payload
+    SNAPSHOT   tick, per snake (flags (1 = alive, direction << 4), score, length, cells
+               from head to tail), per food slot (cell + 1, 0 for none)
+    DELTA      tick, per snake (flags, [head], see below), changed food slot count,
+               (slot, cell + 1) per changed slot
+    GAME_OVER  winner + 1 (0 for a tie)
+    ERROR      message
+    ACK        seq of the last input applied or ignored, sent after the DELTA of that tick
+
+Game -> spectator (see :mod:`src.spectator`)::
+
+    SPECTATE   player count, player names, then a WELCOME payload (snake index = player
+               count, the spectator has no snake); followed by SNAPSHOT, DELTA and GAME_OVER
+
+A DELTA carries only what the tick changed: the new head of every moving snake, a
+flag whether it grew (otherwise its tail cell is dropped), a flag for snakes that died
+and the food slots that changed. Clients apply it to their copy of the state with
+:func:`apply_delta`, which keeps ``grid`` and ``changed`` in sync like the engine does.
+
+Everything read from the peer is checked (board size, player count, cells on the
+board) before the state is touched; bad data raises :class:`ProtocolError` and leaves
+the state as it was.
+"""
+import socket
+import struct
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+
+from src.engine import EMPTY, FOOD, GameState, Snake
+from src.replay import (CODE_DIRECTIONS, DIRECTION_CODES, MAX_BOARD_SIDE, MAX_SNAKES, MIN_BOARD_SIDE, ReplayError,
+                        read_varint, write_varint)
+
+JOIN = 1
+INPUT = 2
+WELCOME = 16
+SNAPSHOT = 17
+DELTA = 18
+GAME_OVER = 19
+ERROR = 20
+ACK = 21
+SPECTATE = 22
+
+HEADER = struct.Struct(">IB")
+MAX_FRAME = 1 << 20
+
+# Snake flags in snapshots and deltas; the direction code sits in bits 4-5
+ALIVE = 1
+DIED = 2
+GREW = 4
+
+
+class ProtocolError(ValueError):
+    """Raised for malformed frames or payloads."""
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    try:
+        return read_varint(data, pos)
+    except ReplayError as err:
+        raise ProtocolError(str(err)) from None
+
+
+def _read_cell(data: bytes, pos: int, size: int) -> Tuple[int, int]:
+    cell, pos = _read_varint(data, pos)
+    if cell >= size:
+        raise ProtocolError(f"Cell {cell} is outside the board")
+    return cell, pos
+
+
+def frame(msg_type: int, payload: bytes = b"") -> bytes:
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+class FrameReader:
+    """Splits a byte stream into (message type, payload) frames."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> Iterator[Tuple[int, bytes]]:
+        self._buffer += data
+        while len(self._buffer) >= HEADER.size:
+            length, msg_type = HEADER.unpack_from(self._buffer)
+            if length > MAX_FRAME:
+                raise ProtocolError(f"Frame of {length} bytes is too large")
+            end = HEADER.size + length
+            if len(self._buffer) < end:
+                return
+            payload = bytes(self._buffer[HEADER.size:end])
+            del self._buffer[:end]
+            yield msg_type, payload
+
+
+class FrameClient(ABC):
+    """
+    Receiving end of a connected, non-blocking socket. :meth:`poll` reads whatever has
+    arrived and passes every complete frame to :meth:`handle`; bad data from the peer
+    closes the connection and is reported in ``error``.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.frames = FrameReader()
+        self.error: Optional[str] = None
+        self.connected = True
+
+    def poll(self) -> List[Tuple[int, bytes]]:
+        """Reads everything the peer has sent so far, applies it and returns the frames."""
+        messages = self._receive()
+        self._handle_all(messages)
+        return messages
+
+    @abstractmethod
+    def handle(self, msg_type: int, payload: bytes) -> None:
+        """Applies one frame; raises :class:`ProtocolError` for bad data."""
+
+    def _receive(self) -> List[Tuple[int, bytes]]:
+        messages: List[Tuple[int, bytes]] = []
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.connected = False
+                break
+            try:
+                messages.extend(self.frames.feed(data))
+            except ProtocolError as err:
+                self._protocol_error(err)
+                break
+        return messages
+
+    def _handle_all(self, messages: List[Tuple[int, bytes]]) -> None:
+        """Handles ``messages`` in order; on bad data the rest is dropped, so the list keeps the applied frames."""
+        for index, (msg_type, payload) in enumerate(messages):
+            try:
+                self.handle(msg_type, payload)
+            except ProtocolError as err:
+                self._protocol_error(err)
+                del messages[index:]
+                break
+
+    def _protocol_error(self, err: ProtocolError) -> None:
+        """Bad data from the peer ends the connection; the state keeps its last valid tick."""
+        self.error = f"Protocol error: {err}"
+        self.close()
+
+    def close(self) -> None:
+        self.connected = False
+        self.sock.close()
+
+
+def _write_string(out: bytearray, text: str) -> None:
+    data = text.encode("utf-8")
+    write_varint(out, len(data))
+    out += data
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    if pos + length > len(data):
+        raise ProtocolError("Unexpected end of string")
+    return data[pos:pos + length].decode("utf-8", errors="replace"), pos + length
+
+
+def encode_join(room: str, name: str) -> bytes:
+    out = bytearray()
+    _write_string(out, room)
+    _write_string(out, name)
+    return frame(JOIN, bytes(out))
+
+
+def decode_join(payload: bytes) -> Tuple[str, str]:
+    room, pos = _read_string(payload, 0)
+    name, _ = _read_string(payload, pos)
+    return room, name
+
+
+def encode_input(seq: int, direction: str) -> bytes:
+    out = bytearray()
+    write_varint(out, seq)
+    out.append(DIRECTION_CODES[direction])
+    return frame(INPUT, bytes(out))
+
+
+def decode_input(payload: bytes) -> Tuple[int, str]:
+    seq, pos = _read_varint(payload, 0)
+    if pos >= len(payload) or payload[pos] >= len(CODE_DIRECTIONS):
+        raise ProtocolError("Invalid input message")
+    return seq, CODE_DIRECTIONS[payload[pos]]
+
+
+def _write_snapshot(out: bytearray, state: GameState) -> None:
+    write_varint(out, state.tick)
+    for snake in state.snakes:
+        out.append((ALIVE if snake.alive else 0) | DIRECTION_CODES[snake.direction] << 4)
+        write_varint(out, snake.score)
+        write_varint(out, len(snake.body))
+        for cell in snake.body:
+            write_varint(out, cell)
+    for food in state.food:
+        write_varint(out, 0 if food is None else food + 1)
+
+
+def encode_snapshot(state: GameState) -> bytes:
+    out = bytearray()
+    _write_snapshot(out, state)
+    return frame(SNAPSHOT, bytes(out))
+
+
+def _write_welcome(out: bytearray, state: GameState, snake_index: int, tick_rate: int) -> None:
+    for value in (snake_index, len(state.snakes), state.width, state.height,
+                  (1 if state.wrap else 0) | (2 if state.last_snake_wins else 0), state.num_food, tick_rate):
+        write_varint(out, value)
+    _write_snapshot(out, state)
+
+
+def encode_welcome(state: GameState, snake_index: int, tick_rate: int) -> bytes:
+    out = bytearray()
+    _write_welcome(out, state, snake_index, tick_rate)
+    return frame(WELCOME, bytes(out))
+
+
+def decode_welcome(payload: bytes) -> Tuple[int, int, GameState]:
+    """Returns (own snake index, tick rate, copy of the server state)."""
+    values = []
+    pos = 0
+    for _ in range(7):
+        value, pos = _read_varint(payload, pos)
+        values.append(value)
+    snake_index, players, width, height, flags, num_food, tick_rate = values
+    if not (MIN_BOARD_SIDE <= width <= MAX_BOARD_SIDE and MIN_BOARD_SIDE <= height <= MAX_BOARD_SIDE):
+        raise ProtocolError(f"Invalid board size {width}x{height}")
+    if not 0 < players <= MAX_SNAKES or snake_index > players:  # spectators get index = players
+        raise ProtocolError(f"Invalid player count {players} or snake index {snake_index}")
+    if num_food > width * height:
+        raise ProtocolError(f"Invalid number of food slots {num_food}")
+    snakes = [Snake([]) for _ in range(players)]
+    state = GameState(width, height, snakes, wrap=bool(flags & 1), num_food=0, last_snake_wins=bool(flags & 2))
+    state.num_food = num_food
+    state.food = [None] * num_food
+    apply_snapshot(state, payload[pos:])
+    return snake_index, tick_rate, state
+
+
+def apply_snapshot(state: GameState, payload: bytes) -> None:
+    """Replaces the snakes and food of ``state`` with a full snapshot."""
+    size = len(state.grid)
+    tick, pos = _read_varint(payload, 0)
+    snakes = []
+    for _ in state.snakes:
+        if pos >= len(payload):
+            raise ProtocolError("Unexpected end of snapshot")
+        flags = payload[pos]
+        pos += 1
+        score, pos = _read_varint(payload, pos)
+        length, pos = _read_varint(payload, pos)
+        if length > size:
+            raise ProtocolError(f"Snake of {length} cells on a board of {size}")
+        cells = []
+        for _ in range(length):
+            cell, pos = _read_cell(payload, pos, size)
+            cells.append(cell)
+        snakes.append((flags, score, cells))
+    food = []
+    for _ in range(state.num_food):
+        cell, pos = _read_cell(payload, pos, size + 1)
+        food.append(cell - 1 if cell else None)
+
+    for i in range(len(state.snakes)):
+        state.kill(i)
+    for slot, old in enumerate(state.food):
+        if old is not None:
+            state.set_cell(old, EMPTY)
+            state.food[slot] = None
+    state.tick = tick
+    for owner, (snake, (flags, score, cells)) in enumerate(zip(state.snakes, snakes), start=1):
+        snake.alive = bool(flags & ALIVE)
+        snake.direction = CODE_DIRECTIONS[flags >> 4 & 3]
+        snake.score = score
+        for cell in reversed(cells):
+            snake.body.push_head(cell)
+            state.set_cell(cell, owner)
+    for slot, cell in enumerate(food):
+        if cell is not None:
+            state.food[slot] = cell
+            state.set_cell(cell, FOOD)
+    state.game_over = False
+
+
+class TickCapture:
+    """What a delta is computed against: scores, alive flags and food before a tick."""
+    __slots__ = ("alive", "scores", "food")
+
+    def __init__(self, state: GameState):
+        self.alive = [snake.alive for snake in state.snakes]
+        self.scores = [snake.score for snake in state.snakes]
+        self.food = list(state.food)
+
+
+def encode_delta(state: GameState, before: TickCapture) -> bytes:
+    """Encodes the changes of the tick that turned ``before`` into ``state``."""
+    out = bytearray()
+    write_varint(out, state.tick)
+    for i, snake in enumerate(state.snakes):
+        flags = DIRECTION_CODES[snake.direction] << 4
+        if snake.score != before.scores[i]:
+            flags |= GREW
+        if snake.alive:
+            out.append(flags | ALIVE)
+            write_varint(out, snake.head)
+        else:
+            out.append(flags | (DIED if before.alive[i] else 0))
+    changed = [(slot, food) for slot, food in enumerate(state.food) if food != before.food[slot]]
+    write_varint(out, len(changed))
+    for slot, food in changed:
+        write_varint(out, slot)
+        write_varint(out, 0 if food is None else food + 1)
+    return frame(DELTA, bytes(out))
+
+
+def apply_delta(state: GameState, payload: bytes) -> None:
+    """
+    Applies one tick to a client copy of the state, in the engine's order: dead snakes
+    are removed, tails dropped and eaten food cleared before the new heads are placed.
+    """
+    size = len(state.grid)
+    tick, pos = _read_varint(payload, 0)
+    moves: List[Tuple[int, Optional[int], int]] = []
+    for i, snake in enumerate(state.snakes):
+        if pos >= len(payload):
+            raise ProtocolError("Unexpected end of delta")
+        flags = payload[pos]
+        pos += 1
+        head = None
+        if flags & ALIVE:
+            head, pos = _read_cell(payload, pos, size)
+            if not flags & (GREW | DIED) and not len(snake.body):
+                raise ProtocolError(f"Snake {i} has no tail to move")
+        moves.append((i, head, flags))
+    count, pos = _read_varint(payload, pos)
+    if count > state.num_food:
+        raise ProtocolError("Too many food changes")
+    food_changes = []
+    for _ in range(count):
+        slot, pos = _read_varint(payload, pos)
+        cell, pos = _read_cell(payload, pos, size + 1)
+        if slot >= state.num_food:
+            raise ProtocolError("Invalid food slot")
+        food_changes.append((slot, cell - 1 if cell else None))
+
+    state.tick = tick
+    for i, head, flags in moves:
+        snake = state.snakes[i]
+        snake.direction = CODE_DIRECTIONS[flags >> 4 & 3]
+        if flags & GREW:
+            snake.score += 1
+        if flags & DIED:
+            state.kill(i)
+        elif head is not None and not flags & GREW:
+            state.set_cell(snake.body.pop_tail(), EMPTY)
+    for slot, _ in food_changes:
+        old = state.food[slot]
+        if old is not None and state.grid[old] == FOOD:
+            state.set_cell(old, EMPTY)
+        state.food[slot] = None
+    for owner, (i, head, flags) in enumerate(moves, start=1):
+        if head is not None:
+            state.snakes[i].body.push_head(head)
+            state.set_cell(head, owner)
+    for slot, cell in food_changes:
+        state.food[slot] = cell
+        if cell is not None:
+            state.set_cell(cell, FOOD)
+
+
+def encode_spectate(state: GameState, names: List[str], tick_rate: int) -> bytes:
+    out = bytearray()
+    write_varint(out, len(names))
+    for name in names:
+        _write_string(out, name)
+    _write_welcome(out, state, len(state.snakes), tick_rate)
+    return frame(SPECTATE, bytes(out))
+
+
+def decode_spectate(payload: bytes) -> Tuple[List[str], int, GameState]:
+    """Returns (player names, tick rate, copy of the game's state)."""
+    count, pos = _read_varint(payload, 0)
+    names = []
+    for _ in range(count):
+        name, pos = _read_string(payload, pos)
+        names.append(name)
+    _, tick_rate, state = decode_welcome(payload[pos:])
+    if len(names) != len(state.snakes):
+        raise ProtocolError("Need one name per snake")
+    return names, tick_rate, state
+
+
+def encode_game_over(winner: Optional[int]) -> bytes:
+    out = bytearray()
+    write_varint(out, 0 if winner is None else winner + 1)
+    return frame(GAME_OVER, bytes(out))
+
+
+def decode_game_over(payload: bytes) -> Optional[int]:
+    winner, _ = _read_varint(payload, 0)
+    return None if winner == 0 else winner - 1
+
+
+def encode_ack(seq: int) -> bytes:
+    out = bytearray()
+    write_varint(out, seq)
+    return frame(ACK, bytes(out))
+
+
+def decode_ack(payload: bytes) -> int:
+    return _read_varint(payload, 0)[0]
+
+
+def encode_error(message: str) -> bytes:
+    out = bytearray()
+    _write_string(out, message)
+    return frame(ERROR, bytes(out))
+
+
+def decode_error(payload: bytes) -> str:
+    return _read_string(payload, 0)[0]
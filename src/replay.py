@@ -0,0 +1,209 @@
+"""
+Deterministic replays: compact recording and headless fast-forward playback.
+
+A game is fully determined by its mode, board size, food seed and the actions
+passed to :func:`src.engine.step`, so a replay stores exactly that. Ticks without
+input and turns into the current direction are not stored; every input is one event (tick gap as varint, then one
+byte with snake index and direction). A typical game fits in a few hundred bytes.
+
+Layout (all integers unsigned LEB128 varints unless noted)::
+
+    b"SNKR" version:u8 mode:u8 width height seed [players, party mode only]
+    event_count (tick_gap (snake << 2 | direction):u8) * event_count
+    total_ticks
+
+Run ``python -m src.replay FILE...`` to re-simulate replay files and print the results.
+"""
+import random
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.engine import DIRECTIONS, GameState, new_multiplayer_state, new_party_state, new_singleplayer_state, step
+
+MAGIC = b"SNKR"
+VERSION = 1
+
+MODE_SINGLEPLAYER = 0
+MODE_MULTIPLAYER = 1
+MODE_PARTY = 2
+
+# (width, height, players, seed) -> initial state; single- and multiplayer have a fixed player count
+STATE_FACTORIES: Dict[int, Callable[[int, int, int, Optional[int]], GameState]] = {
+    MODE_SINGLEPLAYER: lambda width, height, players, seed: new_singleplayer_state(width, height, seed),
+    MODE_MULTIPLAYER: lambda width, height, players, seed: new_multiplayer_state(width, height, seed),
+    MODE_PARTY: new_party_state,
+}
+PLAYERS = {MODE_SINGLEPLAYER: 1, MODE_MULTIPLAYER: 2}
+
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+CODE_DIRECTIONS = list(DIRECTIONS)
+
+MAX_SNAKES = 64  # the snake index shares one byte with the direction code
+MIN_BOARD_SIDE = 16  # the board sizes main.py --board accepts
+MAX_BOARD_SIDE = 1000
+
+
+class ReplayError(ValueError):
+    """Raised for malformed or unsupported replay data."""
+
+
+def new_seed() -> int:
+    return random.getrandbits(63)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Unexpected end of replay data")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """Recording of one game; ``events`` holds (tick, snake index, direction) in tick order."""
+
+    def __init__(self, mode: int, width: int, height: int, seed: int, players: Optional[int] = None):
+        if mode not in STATE_FACTORIES:
+            raise ReplayError(f"Unknown game mode {mode}")
+        if players is None:
+            players = PLAYERS.get(mode)
+        if players is None or not 0 < players <= MAX_SNAKES:
+            raise ReplayError(f"Party replays need a player count between 1 and {MAX_SNAKES}")
+        self.mode = mode
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.players = players
+        self.events: List[Tuple[int, int, str]] = []
+        self.ticks = 0
+
+    def new_state(self) -> GameState:
+        """Creates the initial state the recording started from."""
+        return STATE_FACTORIES[self.mode](self.width, self.height, self.players, self.seed)
+
+    def record(self, state: GameState, actions: Sequence[Optional[str]]) -> None:
+        """
+        Records the actions of the next tick; call it with the arguments of step() before
+        stepping. Turns into the direction a snake already moves are no-ops in step() and
+        are not stored, so bots that return their direction every tick cost nothing.
+        """
+        self.ticks += 1
+        for snake_index, action in enumerate(actions):
+            if action is not None and action != state.snakes[snake_index].direction:
+                self.events.append((self.ticks, snake_index, action))
+
+    def actions(self, snake_count: int) -> Iterator[List[Optional[str]]]:
+        """Yields the action list of every recorded tick."""
+        events = iter(self.events)
+        event = next(events, None)
+        for tick in range(1, self.ticks + 1):
+            actions: List[Optional[str]] = [None] * snake_count
+            while event is not None and event[0] == tick:
+                actions[event[1]] = event[2]
+                event = next(events, None)
+            yield actions
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out.append(self.mode)
+        for value in (self.width, self.height, self.seed):
+            write_varint(out, value)
+        if self.mode not in PLAYERS:
+            write_varint(out, self.players)
+        write_varint(out, len(self.events))
+        last_tick = 0
+        for tick, snake_index, direction in self.events:
+            if snake_index >= MAX_SNAKES:
+                raise ReplayError(f"At most {MAX_SNAKES} snakes can be recorded")
+            write_varint(out, tick - last_tick)
+            out.append(snake_index << 2 | DIRECTION_CODES[direction])
+            last_tick = tick
+        write_varint(out, self.ticks)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if data[:len(MAGIC)] != MAGIC:
+            raise ReplayError("Not a replay file")
+        pos = len(MAGIC)
+        if len(data) < pos + 2 or data[pos] != VERSION:
+            raise ReplayError("Unsupported replay version")
+        mode = data[pos + 1]
+        pos += 2
+        width, pos = read_varint(data, pos)
+        height, pos = read_varint(data, pos)
+        seed, pos = read_varint(data, pos)
+        players = None
+        if mode not in PLAYERS:
+            players, pos = read_varint(data, pos)
+        if not (MIN_BOARD_SIDE <= width <= MAX_BOARD_SIDE and MIN_BOARD_SIDE <= height <= MAX_BOARD_SIDE):
+            raise ReplayError(f"Invalid board size {width}x{height}")
+        replay = cls(mode, width, height, seed, players)
+        count, pos = read_varint(data, pos)
+        tick = 0
+        for _ in range(count):
+            gap, pos = read_varint(data, pos)
+            if pos >= len(data):
+                raise ReplayError("Unexpected end of replay data")
+            packed = data[pos]
+            pos += 1
+            if packed >> 2 >= replay.players:
+                raise ReplayError(f"Event for snake {packed >> 2} in a replay of {replay.players}")
+            tick += gap
+            replay.events.append((tick, packed >> 2, CODE_DIRECTIONS[packed & 3]))
+        replay.ticks, pos = read_varint(data, pos)
+        if tick > replay.ticks:
+            raise ReplayError("Replay events run past its last tick")
+        return replay
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def play(replay: Replay) -> GameState:
+    """Re-simulates a replay headlessly and returns the final state."""
+    state = replay.new_state()
+    for actions in replay.actions(len(state.snakes)):
+        step(state, actions)
+    return state
+
+
+def verify_score(replay: Replay, claimed_score: int, snake_index: int = 0) -> bool:
+    """Checks a submitted score: the replay must end the game with exactly that score."""
+    state = play(replay)
+    return state.game_over and state.snakes[snake_index].score == claimed_score
+
+
+def main(paths: Sequence[str]) -> None:
+    for path in paths:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        state = play(replay)
+        elapsed = time.perf_counter() - start
+        scores = ", ".join(str(snake.score) for snake in state.snakes)
+        print(f"{path}: {replay.ticks} ticks, scores {scores}, game over: {state.game_over}, "
+              f"{replay.ticks / max(elapsed, 1e-9):,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,175 @@
+import json
+import os
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config.json")
+DISPLAY_TIMEZONE = "Europe/Berlin"
+
+# (Spielername, Score, Zeitpunkt in UTC) beim Schreiben, (Spielername, Score, formatierter Zeitpunkt) beim Lesen
+ScoreRow = Tuple[str, int, datetime]
+HighscoreRow = Tuple[str, int, str]
+# Position in der Bestenliste für Keyset-Pagination: (Score, Spielername) der letzten Zeile einer Seite
+LeaderboardCursor = Tuple[int, str]
+
+
+def load_config(config_path: Optional[str] = None) -> dict:
+    """
+    Lädt die Konfigurationsdaten aus der JSON-Datei.
+
+    :param config_path: Pfad zur Konfigurationsdatei (optional)
+    :return: Konfigurationsdaten als Dictionary
+    :raises FileNotFoundError: Wenn die Datei nicht gefunden wird.
+    :raises json.JSONDecodeError: Wenn die Datei ungültig ist.
+    """
+    if config_path is None:
+        config_path = DEFAULT_CONFIG_PATH
+
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Konfigurationsdatei {config_path} nicht gefunden!")
+
+    with open(config_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def format_achieved_at(achieved_at: datetime) -> str:
+    """
+    Formatiert einen UTC-Zeitpunkt wie die Datenbank (``YYYY-MM-DD HH24:MI`` in Berliner Zeit).
+
+    :param achieved_at: Zeitpunkt in UTC (naiv oder mit Zeitzone)
+    :return: Formatierter Zeitpunkt
+    """
+    if achieved_at.tzinfo is None:
+        achieved_at = achieved_at.replace(tzinfo=timezone.utc)
+    try:
+        achieved_at = achieved_at.astimezone(ZoneInfo(DISPLAY_TIMEZONE))
+    except ZoneInfoNotFoundError:
+        pass
+    return achieved_at.strftime("%Y-%m-%d %H:%M")
+
+
+def best_per_player(scores: List[ScoreRow]) -> List[ScoreRow]:
+    """
+    Reduziert Scores auf den besten pro Spieler (bei Gleichstand den früheren).
+
+    :param scores: Liste von (Spielername, Score, Zeitpunkt in UTC)
+    :return: Höchstens ein Eintrag pro Spieler
+    """
+    best = {}
+    for name, score, achieved_at in scores:
+        current = best.get(name)
+        if current is None or score > current[1] or (score == current[1] and achieved_at < current[2]):
+            best[name] = (name, score, achieved_at)
+    return list(best.values())
+
+
+def leaderboard_cursor(row: HighscoreRow) -> LeaderboardCursor:
+    """Cursor für die Seite nach ``row`` (letzte Zeile der aktuellen Seite)."""
+    return row[1], row[0]
+
+
+class ScoreStore(ABC):
+    """
+    Schnittstelle für die Highscore-Speicherung.
+
+    Alle Methoden melden Fehler über ihren Rückgabewert (False, None bzw. leere Liste)
+    statt über Exceptions, damit das Spiel auch ohne erreichbaren Speicher weiterläuft.
+
+    Neben den einzelnen Spielen pflegen die Backends eine Bestenliste mit dem besten Score
+    pro Spieler (Tabelle ``player_best``, indiziert nach Score). Bestenliste, Rang und
+    bester Score pro Spieler lesen nur diese Tabelle über den Index.
+    """
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+    def insert_score(self, player_name: str, score: int) -> bool:
+        """
+        Fügt den übergebenen Score mit dem aktuellen Zeitstempel ein.
+
+        :param player_name: Name des Spielers
+        :param score: Score des Spielers
+        :return: True bei Erfolg, False bei Fehlern
+        """
+        if score <= 0:
+            logger.warning("⚠️ Score muss größer als 0 sein!")
+            return False
+        return self.insert_scores([(player_name, score, datetime.now(timezone.utc).replace(tzinfo=None))])
+
+    @abstractmethod
+    def insert_scores(self, scores: List[ScoreRow]) -> bool:
+        """
+        Fügt mehrere Scores in einem Schritt ein.
+
+        :param scores: Liste von (Spielername, Score, Zeitpunkt in UTC)
+        :return: True bei Erfolg, False bei Fehlern (dann wurde nichts eingefügt)
+        """
+
+    @abstractmethod
+    def get_top_scores(self, limit: int = 10) -> List[HighscoreRow]:
+        """
+        Gibt die Top-Scores absteigend nach Score zurück.
+
+        :param limit: Maximale Anzahl der zurückgegebenen Scores
+        :return: Liste von (Spielername, Score, Erreicht-Zeitpunkt)
+        """
+
+    @abstractmethod
+    def get_leaderboard(self, limit: int = 10, after: Optional[LeaderboardCursor] = None) -> List[HighscoreRow]:
+        """
+        Gibt eine Seite der Bestenliste zurück (bester Score pro Spieler, absteigend nach Score,
+        bei Gleichstand nach Name).
+
+        :param limit: Maximale Anzahl der Einträge pro Seite
+        :param after: Cursor der vorherigen Seite (siehe ``leaderboard_cursor``), None für die erste Seite
+        :return: Liste von (Spielername, Score, Erreicht-Zeitpunkt)
+        """
+
+    @abstractmethod
+    def get_player_best(self, player_name: str) -> Optional[int]:
+        """
+        Gibt den besten Score eines Spielers zurück.
+
+        :param player_name: Name des Spielers
+        :return: Bester Score oder None, wenn der Spieler keinen Score hat oder ein Fehler auftrat
+        """
+
+    @abstractmethod
+    def get_rank(self, score: int) -> Optional[int]:
+        """
+        Gibt den Platz zurück, den ein Score in der Bestenliste (ein Eintrag pro Spieler) erreichen würde.
+
+        :param score: Zu bewertender Score
+        :return: Platz (1 = bester Score) oder None bei Fehlern
+        """
+
+    def close(self) -> None:
+        """Gibt alle Verbindungen frei."""
+
+
+def create_score_store(config_path: Optional[str] = None) -> ScoreStore:
+    """
+    Erzeugt das in der Konfiguration gewählte Backend (``SCORE_BACKEND``: "postgres" oder "sqlite").
+    Ohne Angabe wird wie bisher PostgreSQL verwendet.
+
+    :param config_path: Pfad zur Konfigurationsdatei (optional)
+    :return: Das Score-Backend
+    :raises ValueError: Wenn das Backend unbekannt ist.
+    """
+    config = load_config(config_path)
+    backend = config.get("SCORE_BACKEND", "postgres").lower()
+
+    # Backends werden erst hier importiert, damit z.B. SQLite ohne psycopg2 läuft
+    if backend == "postgres":
+        from src.db_score import DBScore
+        return DBScore(config_path)
+    if backend == "sqlite":
+        from src.sqlite_score import SQLiteScore
+        return SQLiteScore(config.get("SQLITE_PATH"))
+    raise ValueError(f"Unbekanntes Score-Backend: {backend}")
@@ -0,0 +1,172 @@
+import json
+import os
+import queue
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from src.score_store import ScoreRow
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ScoreWriter:
+    def __init__(self, db, journal_path: Optional[str] = None, max_queue: int = 100, batch_size: int = 50,
+                 max_retries: int = 5, backoff: float = 0.5,
+                 on_written: Optional[Callable[[List[ScoreRow]], None]] = None):
+        """
+        Schreibt Highscores im Hintergrund, damit der Spiel-Thread nie auf das Netzwerk wartet.
+
+        Scores landen in einer begrenzten Queue und werden von einem Worker-Thread gesammelt
+        mit einem mehrzeiligen INSERT (``db.insert_scores``) geschrieben. Schlägt das fehl,
+        wird mit exponentiellem Backoff erneut versucht. Was beim Beenden noch nicht
+        geschrieben ist, wird in eine lokale Journal-Datei (JSON Lines) geschrieben und beim
+        nächsten Start erneut eingereiht.
+
+        :param db: Objekt mit ``insert_scores(scores) -> bool``, z.B. DBScore
+        :param journal_path: Pfad zur Journal-Datei (optional)
+        :param max_queue: Maximale Anzahl wartender Scores
+        :param batch_size: Maximale Anzahl Scores pro INSERT
+        :param max_retries: Versuche pro Batch, bevor er ins Journal geschrieben wird
+        :param backoff: Wartezeit in Sekunden vor dem ersten Wiederholungsversuch
+        :param on_written: Wird im Worker-Thread mit jedem erfolgreich geschriebenen Batch aufgerufen
+        """
+        if journal_path is None:
+            journal_path = os.path.join(os.path.dirname(__file__), "..", "score_journal.jsonl")
+
+        self.db = db
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.on_written = on_written
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight: List[ScoreRow] = []
+
+        for row in self._load_journal():
+            self._enqueue(row)
+
+        self._thread = threading.Thread(target=self._run, name="ScoreWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, player_name: str, score: int) -> bool:
+        """
+        Reiht einen Score zum Schreiben ein, ohne zu blockieren.
+
+        :param player_name: Name des Spielers
+        :param score: Score des Spielers
+        :return: False, wenn der Score ungültig ist; bei voller Queue landet er direkt im Journal
+        """
+        if score <= 0:
+            logger.warning("⚠️ Score muss größer als 0 sein!")
+            return False
+        achieved_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._enqueue((player_name, score, achieved_at))
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Beendet den Worker und schreibt alle nicht gespeicherten Scores ins Journal.
+
+        :param timeout: Maximale Wartezeit in Sekunden für den laufenden Schreibvorgang
+        """
+        self._stopping.set()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+        with self._lock:
+            pending = list(self._in_flight)
+            self._in_flight = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+        self._write_journal(pending)
+
+    def _enqueue(self, row: ScoreRow) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("⚠️ Score-Queue voll, Score wird ins Journal geschrieben")
+            self._write_journal([row])
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            with self._lock:
+                self._in_flight = batch
+            written = self._write_batch(batch)
+            with self._lock:
+                if self._in_flight is batch:
+                    self._in_flight = []
+                    if not written:
+                        self._write_journal(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[ScoreRow]) -> bool:
+        """Schreibt einen Batch mit Wiederholungen und exponentiellem Backoff."""
+        for attempt in range(self.max_retries):
+            if self.db.insert_scores(batch):
+                if self.on_written is not None:
+                    self.on_written(batch)
+                return True
+            # wait() kehrt sofort zurück, sobald close() aufgerufen wurde
+            if self._stopping.wait(self.backoff * 2 ** attempt):
+                return False
+        logger.error(f"❌ {len(batch)} Score(s) nach {self.max_retries} Versuchen nicht gespeichert")
+        return False
+
+    def _write_journal(self, rows: List[ScoreRow]) -> None:
+        if not rows:
+            return
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as file:
+                for name, score, achieved_at in rows:
+                    file.write(json.dumps({"name": name, "score": score,
+                                           "achieved_at": achieved_at.isoformat()}) + "\n")
+            logger.info(f"💾 {len(rows)} Score(s) im Journal {self.journal_path} gesichert")
+        except OSError as err:
+            logger.error(f"❌ Fehler beim Schreiben des Journals: {err}")
+
+    def _load_journal(self) -> List[ScoreRow]:
+        """Liest das Journal vom letzten Start ein und löscht es."""
+        if not os.path.exists(self.journal_path):
+            return []
+        rows = []
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        rows.append((entry["name"], entry["score"], datetime.fromisoformat(entry["achieved_at"])))
+            os.remove(self.journal_path)
+        except (OSError, ValueError, KeyError) as err:
+            logger.error(f"❌ Fehler beim Lesen des Journals: {err}")
+            return []
+        return rows
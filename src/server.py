@@ -0,0 +1,252 @@
+"""
+Authoritative game server for networked multiplayer.
+
+One asyncio process hosts any number of rooms. Clients connect over TCP, send JOIN
+with a room name and then their inputs (see :mod:`src.protocol`). A room starts once
+its seats are taken; from then on the server alone advances the game with
+:func:`src.engine.step` at a fixed tick rate and broadcasts one small DELTA frame per
+tick to everybody in the room. Clients that cannot keep up are disconnected rather
+than slowing the room down; their snake keeps going straight.
+
+Run from the repository root:
+
+    python -m src.server --port 8765 --players 2
+"""
+import argparse
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.bots import Controller, pathfinding_bot
+from src.engine import GameState, new_multiplayer_state, new_party_state, step
+from src.protocol import (INPUT, JOIN, FrameReader, ProtocolError, TickCapture, decode_input, decode_join,
+                          encode_ack, encode_delta, encode_error, encode_game_over, encode_welcome)
+from src.replay import MAX_BOARD_SIDE, MAX_SNAKES, MIN_BOARD_SIDE, new_seed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_WIDTH = 80
+DEFAULT_HEIGHT = 80
+DEFAULT_TICK_RATE = 30
+INPUT_BUFFER_SIZE = 3
+MAX_WRITE_BUFFER = 256 * 1024  # bytes queued for one client before it counts as too slow
+
+
+class Connection:
+    """One connected client; ``snake_index`` is its seat once it has joined a room."""
+
+    def __init__(self, writer: asyncio.StreamWriter, name: str):
+        self.writer = writer
+        self.name = name
+        self.snake_index: Optional[int] = None
+        self.acked = 0  # sequence number of the last input applied or ignored
+        self.sent_ack = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing()
+
+    def send(self, data: bytes) -> None:
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            logger.warning(f"Client {self.name} is too slow, disconnecting")
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+
+class Room:
+    """A board with a fixed number of seats; the remaining snakes are steered by ``bots``."""
+
+    def __init__(self, name: str, players: int, bots: int = 0, width: int = DEFAULT_WIDTH,
+                 height: int = DEFAULT_HEIGHT, tick_rate: int = DEFAULT_TICK_RATE,
+                 bot: Controller = pathfinding_bot):
+        self.name = name
+        self.seats = players - bots
+        self.tick_rate = tick_rate
+        self.seed = new_seed()
+        if players == 2:
+            self.state: GameState = new_multiplayer_state(width, height, self.seed)
+        else:
+            self.state = new_party_state(width, height, players, self.seed)
+        self.connections: List[Connection] = []
+        self.queues: List[Deque[Tuple[int, str]]] = [deque() for _ in range(players)]  # (seq, direction)
+        self.controllers: List[Optional[Controller]] = [None] * self.seats + [bot] * bots
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def full(self) -> bool:
+        return len(self.connections) >= self.seats
+
+    def join(self, connection: Connection) -> None:
+        connection.snake_index = len(self.connections)
+        self.connections.append(connection)
+
+    def queue_input(self, connection: Connection, seq: int, direction: str) -> None:
+        """
+        Buffers a turn like a key press; one queued turn is applied per tick.
+
+        An ignored input is acknowledged together with the input queued before it, so
+        acknowledgements stay in order.
+        """
+        queue = self.queues[connection.snake_index]
+        last = queue[-1][1] if queue else self.state.snakes[connection.snake_index].direction
+        if direction != last and len(queue) < INPUT_BUFFER_SIZE:
+            queue.append((seq, direction))
+        elif queue:
+            queue[-1] = (seq, queue[-1][1])
+        else:
+            connection.acked = max(connection.acked, seq)
+
+    def broadcast(self, data: bytes) -> None:
+        for connection in self.connections:
+            connection.send(data)
+
+    def tick(self) -> None:
+        actions: List[Optional[str]] = [None] * len(self.queues)
+        for connection in self.connections:
+            queue = self.queues[connection.snake_index]
+            if queue:
+                connection.acked, actions[connection.snake_index] = queue.popleft()
+        for i, controller in enumerate(self.controllers):
+            if controller is not None and self.state.snakes[i].alive:
+                actions[i] = controller(self.state, i)
+        before = TickCapture(self.state)
+        step(self.state, actions)
+        self.broadcast(encode_delta(self.state, before))
+        for connection in self.connections:
+            if connection.acked != connection.sent_ack:
+                connection.send(encode_ack(connection.acked))
+                connection.sent_ack = connection.acked
+
+    async def run(self) -> None:
+        """Welcomes every player, then ticks at the fixed rate until the game is over."""
+        for connection in self.connections:
+            connection.send(encode_welcome(self.state, connection.snake_index, self.tick_rate))
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while not self.state.game_over:
+            if all(connection.closed for connection in self.connections):
+                logger.info(f"Room {self.name}: all players left")
+                return
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < -5 * interval:
+                next_tick = loop.time()  # fell far behind, do not try to catch up
+            await asyncio.sleep(max(delay, 0))
+            self.tick()
+        self.broadcast(encode_game_over(self.state.winner))
+        logger.info(f"Room {self.name}: game over after {self.state.tick} ticks, winner {self.state.winner}")
+
+
+class GameServer:
+    """Accepts clients, puts them into rooms by name and starts each room once it is full."""
+
+    def __init__(self, players: int = 2, bots: int = 0, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                 tick_rate: int = DEFAULT_TICK_RATE):
+        if not 0 <= bots < players:
+            raise ValueError("A room needs at least one seat for a player")
+        if not (MIN_BOARD_SIDE <= width <= MAX_BOARD_SIDE and MIN_BOARD_SIDE <= height <= MAX_BOARD_SIDE):
+            raise ValueError(f"Width and height must be between {MIN_BOARD_SIDE} and {MAX_BOARD_SIDE}")
+        if not 2 <= players <= min(MAX_SNAKES, height):
+            raise ValueError(f"A room needs between 2 and {min(MAX_SNAKES, height)} players on this board")
+        self.players = players
+        self.bots = bots
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.rooms: Dict[str, Room] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    def _room_for(self, name: str) -> Optional[Room]:
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, self.players, self.bots, self.width, self.height, self.tick_rate)
+            self.rooms[name] = room
+        return None if room.full else room
+
+    def _start(self, room: Room) -> None:
+        room.task = asyncio.create_task(room.run())
+        room.task.add_done_callback(lambda task: self._finished(room, task))
+
+    def _finished(self, room: Room, task: asyncio.Task) -> None:
+        """Frees the room name for the next game and closes the connections."""
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Room {room.name} crashed: {task.exception()!r}")
+        for connection in room.connections:
+            connection.writer.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        frames = FrameReader()
+        connection: Optional[Connection] = None
+        room: Optional[Room] = None
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    return
+                for msg_type, payload in frames.feed(data):
+                    if msg_type == JOIN and connection is None:
+                        room_name, name = decode_join(payload)
+                        connection = Connection(writer, name)
+                        room = self._room_for(room_name)
+                        if room is None:
+                            writer.write(encode_error(f"Room {room_name} is already playing"))
+                            return
+                        room.join(connection)
+                        logger.info(f"{name} joined room {room_name} ({len(room.connections)}/{room.seats})")
+                        if room.full:
+                            self._start(room)
+                    elif msg_type == INPUT and room is not None:
+                        seq, direction = decode_input(payload)
+                        room.queue_input(connection, seq, direction)
+                    else:
+                        raise ProtocolError(f"Unexpected message type {msg_type}")
+        except ValueError as err:  # includes ProtocolError and truncated varints
+            logger.warning(f"Dropping client: {err}")
+            writer.write(encode_error(str(err)))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            if room is not None and not room.full:
+                room.connections.remove(connection)  # left the waiting room, free the seat
+                for index, waiting in enumerate(room.connections):
+                    waiting.snake_index = index
+
+
+async def serve(host: str, port: int, server: GameServer) -> None:
+    listener = await server.start(host, port)
+    logger.info(f"Listening on {host}:{port} ({server.players} snakes per room, {server.bots} bots)")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Authoritative Snake server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=2, help="snakes per room")
+    parser.add_argument("--bots", type=int, default=0, help="snakes per room steered by the server")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--tick-rate", type=int, default=DEFAULT_TICK_RATE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    server = GameServer(args.players, args.bots, args.width, args.height, args.tick_rate)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
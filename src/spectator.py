@@ -0,0 +1,195 @@
+"""
+Spectator feed: streams a local game to any number of viewers.
+
+The game publishes its state once per tick (see ``MultiplayerLogic``); :class:`SpectatorFeed`
+encodes the tick once as a DELTA frame (:mod:`src.protocol`) and fans it out to every
+connected viewer over non-blocking sockets, so the game loop never waits for a viewer.
+
+Backpressure is per viewer: bytes the socket did not take stay queued for that viewer
+only. While anything is still queued, further deltas are dropped for it; once its queue
+has drained it gets one SNAPSHOT of the current state instead of the frames it missed and
+continues with deltas. A slow viewer therefore skips frames but never falls further
+behind than one frame, and the memory per viewer stays bounded.
+
+:class:`FeedClient` is the receiving end, a copy of the game's state kept up to date
+from the feed; ``src/viewer.py`` draws it with the game's own drawing code.
+"""
+import logging
+import socket
+from typing import List, Optional, Sequence, Tuple
+
+from src.engine import GameState
+from src.protocol import (DELTA, GAME_OVER, SNAPSHOT, SPECTATE, FrameClient, TickCapture, apply_delta, apply_snapshot,
+                          decode_game_over, decode_spectate, encode_delta, encode_game_over, encode_snapshot,
+                          encode_spectate)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8766
+MAX_VIEWERS = 64
+
+
+class Viewer:
+    """One connected spectator and the bytes it has not taken yet."""
+
+    def __init__(self, sock: socket.socket, address: Tuple[str, int]):
+        self.sock = sock
+        self.address = address
+        self.pending = bytearray()
+        self.welcomed = False  # got the SPECTATE of the current game
+        self.stale = False  # missed a delta, needs a snapshot
+        self.dropped = 0
+        self.closed = False
+
+    def flush(self) -> bool:
+        """Sends as much of the queue as the socket takes; returns whether it is empty."""
+        while self.pending and not self.closed:
+            try:
+                sent = self.sock.send(self.pending)
+            except (BlockingIOError, InterruptedError):
+                return False
+            except OSError:
+                self.close()
+                return False
+            del self.pending[:sent]
+        return not self.pending
+
+    def close(self) -> None:
+        self.closed = True
+        self.pending.clear()
+        self.sock.close()
+
+
+class SpectatorFeed:
+    """
+    Listens for viewers on ``host``:``port`` and sends them every tick of the published game.
+
+    Call :meth:`publish` after every tick; a new ``state`` object starts a new game for
+    all viewers. Nothing blocks: new viewers are accepted and queues are flushed inside
+    :meth:`publish`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, tick_rate: int = 30,
+                 max_viewers: int = MAX_VIEWERS):
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.address = self.listener.getsockname()[:2]
+        self.tick_rate = tick_rate
+        self.max_viewers = max_viewers
+        self.viewers: List[Viewer] = []
+        self.state: Optional[GameState] = None
+        self.names: List[str] = []
+        self.ended = False
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, address = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as err:
+                logger.warning(f"Accepting a viewer failed: {err}")
+                return
+            if len(self.viewers) >= self.max_viewers:
+                sock.close()
+                continue
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.viewers.append(Viewer(sock, address))
+            logger.info(f"Viewer {address[0]}:{address[1]} connected ({len(self.viewers)} watching)")
+
+    def publish(self, state: GameState, names: Sequence[str], before: TickCapture) -> int:
+        """
+        Sends the tick that turned ``before`` into ``state`` to every viewer that keeps
+        up and returns how many viewers had to skip it.
+        """
+        if state is not self.state:
+            self.state = state
+            self.names = list(names)
+            self.ended = False
+            for viewer in self.viewers:
+                viewer.welcomed = False
+        self._accept()
+
+        delta = encode_delta(state, before)
+        snapshot = welcome = None
+        skipped = 0
+        for viewer in self.viewers:
+            if not viewer.flush():
+                if viewer.welcomed:
+                    viewer.stale = True
+                    viewer.dropped += 1
+                    skipped += 1
+                continue
+            if not viewer.welcomed:
+                welcome = welcome or encode_spectate(state, self.names, self.tick_rate)
+                viewer.pending += welcome
+                viewer.welcomed = True
+                viewer.stale = False
+            elif viewer.stale:
+                snapshot = snapshot or encode_snapshot(state)
+                viewer.pending += snapshot
+                viewer.stale = False
+            else:
+                viewer.pending += delta
+            viewer.flush()
+
+        if state.game_over and not self.ended:
+            self._end(state)
+        self._remove_closed()
+        return skipped
+
+    def _end(self, state: GameState) -> None:
+        """Queues the result for every viewer of this game, after the final state if it missed frames."""
+        self.ended = True
+        game_over = encode_game_over(state.winner)
+        for viewer in self.viewers:
+            if not viewer.welcomed:
+                continue
+            if viewer.stale:
+                viewer.pending += encode_snapshot(state)
+                viewer.stale = False
+            viewer.pending += game_over
+            viewer.flush()
+
+    def _remove_closed(self) -> None:
+        for viewer in self.viewers:
+            if viewer.closed:
+                logger.info(f"Viewer {viewer.address[0]}:{viewer.address[1]} left, {viewer.dropped} frames dropped")
+        self.viewers = [viewer for viewer in self.viewers if not viewer.closed]
+
+    def close(self) -> None:
+        for viewer in self.viewers:
+            viewer.close()
+        self.viewers.clear()
+        self.listener.close()
+
+
+class FeedClient(FrameClient):
+    """
+    Connection to a :class:`SpectatorFeed`. ``state`` is None until a game is running;
+    every new game replaces it, so callers should compare it by identity.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        super().__init__(socket.create_connection((host, port), timeout=timeout))
+        self.state: Optional[GameState] = None
+        self.names: List[str] = []
+        self.tick_rate: Optional[int] = None
+        self.game_over = False
+        self.winner: Optional[int] = None
+
+    def handle(self, msg_type: int, payload: bytes) -> None:
+        if msg_type == SPECTATE:
+            self.names, self.tick_rate, self.state = decode_spectate(payload)
+            self.game_over = False
+            self.winner = None
+        elif msg_type == SNAPSHOT and self.state is not None:
+            apply_snapshot(self.state, payload)
+        elif msg_type == DELTA and self.state is not None:
+            apply_delta(self.state, payload)
+        elif msg_type == GAME_OVER and self.state is not None:
+            self.winner = decode_game_over(payload)
+            self.game_over = True
+            self.state.winner = self.winner
+            self.state.game_over = True
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from typing import List, Optional
+from src.score_store import HighscoreRow, LeaderboardCursor, ScoreRow, ScoreStore, best_per_player, format_achieved_at
+
+logger = logging.getLogger(__name__)
+
+# Schema-Migrationen, werden der Reihe nach genau einmal ausgeführt (Stand in PRAGMA user_version)
+MIGRATIONS = [
+    # 1: Tabelle aller Spiele mit Index auf score
+    """
+    CREATE TABLE IF NOT EXISTS gamescore (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        achieved_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS gamescore_score_idx ON gamescore (score DESC);
+    """,
+    # 2: Bestenliste mit dem besten Score pro Spieler
+    """
+    CREATE TABLE IF NOT EXISTS player_best (
+        name TEXT PRIMARY KEY,
+        score INTEGER NOT NULL,
+        achieved_at TEXT NOT NULL
+    );
+    INSERT OR IGNORE INTO player_best (name, score, achieved_at)
+        SELECT name, score, MIN(achieved_at) FROM gamescore AS g
+        WHERE score = (SELECT MAX(score) FROM gamescore WHERE name = g.name)
+        GROUP BY name;
+    CREATE INDEX IF NOT EXISTS player_best_score_idx ON player_best (score DESC, name);
+    """,
+]
+
+
+class SQLiteScore(ScoreStore):
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Eingebettetes Score-Backend auf Basis von SQLite, ohne Server und Netzwerk.
+
+        Die Datenbank läuft im WAL-Modus (Lesen blockiert Schreiben nicht) und hat einen
+        Index auf ``score``, damit die Bestenliste ohne Sortierung aller Zeilen gelesen wird.
+        Zeitpunkte werden als ISO-Text in UTC gespeichert.
+
+        :param db_path: Pfad zur Datenbankdatei (optional, ":memory:" für Tests)
+        """
+        if db_path is None:
+            db_path = os.path.join(os.path.dirname(__file__), "..", "scores.db")
+
+        self.db_path = db_path
+        # Eine Verbindung für alle Threads, abgesichert durch ein Lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Bringt das Datenbankschema auf den Stand von MIGRATIONS."""
+        current = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        for version, migration in enumerate(MIGRATIONS[current:], start=current + 1):
+            # executescript committet selbst, deshalb steht die Versionsnummer im selben Skript
+            self._conn.executescript(f"BEGIN; {migration} PRAGMA user_version = {version}; COMMIT;")
+            logger.info(f"✅ Datenbankschema auf Version {version} migriert")
+
+    def insert_scores(self, scores: List[ScoreRow]) -> bool:
+        """
+        Fügt mehrere Scores in einer Transaktion ein und aktualisiert die Bestenliste.
+
+        :param scores: Liste von (Spielername, Score, Zeitpunkt in UTC)
+        :return: True bei Erfolg, False bei Fehlern (dann wurde nichts eingefügt)
+        """
+        query = "INSERT INTO gamescore (name, score, achieved_at) VALUES (?, ?, ?)"
+        best_query = """
+            INSERT INTO player_best (name, score, achieved_at) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET score = excluded.score, achieved_at = excluded.achieved_at
+            WHERE player_best.score < excluded.score
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(query, [(name, score, achieved_at.isoformat(sep=" "))
+                                               for name, score, achieved_at in scores])
+                self._conn.executemany(best_query, [(name, score, achieved_at.isoformat(sep=" "))
+                                                    for name, score, achieved_at in best_per_player(scores)])
+            return True
+        except sqlite3.Error as err:
+            logger.error(f"❌ Fehler beim Einfügen der Scores: {err}")
+            return False
+
+    def get_top_scores(self, limit: int = 10) -> List[HighscoreRow]:
+        """
+        Gibt die Top-Scores (Spielername, Score, Erreicht-Zeitpunkt) als Liste von Tupeln zurück,
+        sortiert absteigend nach Score.
+
+        :param limit: Maximale Anzahl der zurückgegebenen Scores
+        :return: Liste der Top-Scores
+        """
+        query = "SELECT name, score, achieved_at FROM gamescore ORDER BY score DESC LIMIT ?"
+        try:
+            with self._lock:
+                rows = self._conn.execute(query, (limit,)).fetchall()
+        except sqlite3.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen der Highscores: {err}")
+            return []
+        return [(name, score, format_achieved_at(datetime.fromisoformat(achieved_at)))
+                for name, score, achieved_at in rows]
+
+    def get_leaderboard(self, limit: int = 10, after: Optional[LeaderboardCursor] = None) -> List[HighscoreRow]:
+        """
+        Gibt eine Seite der Bestenliste zurück (bester Score pro Spieler, absteigend nach Score,
+        bei Gleichstand nach Name). Liest per Keyset-Pagination über den Index player_best_score_idx.
+
+        :param limit: Maximale Anzahl der Einträge pro Seite
+        :param after: Cursor der vorherigen Seite, None für die erste Seite
+        :return: Liste von (Spielername, Score, Erreicht-Zeitpunkt)
+        """
+        if after is None:
+            where, params = "", (limit,)
+        else:
+            after_score, after_name = after
+            where = "WHERE score < ? OR (score = ? AND name > ?)"
+            params = (after_score, after_score, after_name, limit)
+        query = f"SELECT name, score, achieved_at FROM player_best {where} ORDER BY score DESC, name LIMIT ?"
+        try:
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+        except sqlite3.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen der Bestenliste: {err}")
+            return []
+        return [(name, score, format_achieved_at(datetime.fromisoformat(achieved_at)))
+                for name, score, achieved_at in rows]
+
+    def get_player_best(self, player_name: str) -> Optional[int]:
+        """
+        Gibt den besten Score eines Spielers zurück.
+
+        :param player_name: Name des Spielers
+        :return: Bester Score oder None, wenn der Spieler keinen Score hat oder ein Fehler auftrat
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT score FROM player_best WHERE name = ?", (player_name,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen des besten Scores: {err}")
+            return None
+
+    def get_rank(self, score: int) -> Optional[int]:
+        """
+        Gibt den Platz zurück, den ein Score in der Bestenliste (ein Eintrag pro Spieler) erreichen würde.
+
+        :param score: Zu bewertender Score
+        :return: Platz (1 = bester Score) oder None bei Fehlern
+        """
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) + 1 FROM player_best WHERE score > ?",
+                                          (score,)).fetchone()[0]
+        except sqlite3.Error as err:
+            logger.error(f"❌ Fehler beim Abrufen des Rangs: {err}")
+            return None
+
+    def close(self) -> None:
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            self._conn.close()
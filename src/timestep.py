@@ -0,0 +1,47 @@
+"""
+Fixed-timestep scheduler that decouples the simulation rate from the render rate.
+"""
+import time
+from typing import Callable, Optional
+
+
+class FixedTimestep:
+    """
+    Accumulator-based scheduler: real elapsed time is collected and paid out in
+    whole simulation ticks of ``1 / tick_rate`` seconds.
+
+    A slow frame is caught up with several ticks in the next frame (at most
+    ``max_steps``; anything beyond that is dropped so a long stall does not make the
+    game fast-forward).
+    """
+
+    def __init__(self, tick_rate: float, max_steps: int = 5, clock: Callable[[], float] = time.perf_counter):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self._last: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forgets the elapsed time, e.g. after a menu or a blocking screen."""
+        self.accumulator = 0.0
+        self._last = None
+
+    def advance(self) -> int:
+        """Returns how many simulation ticks are due since the last call."""
+        now = self.clock()
+        if self._last is None:
+            # The first frame runs one tick so the game starts moving immediately
+            self._last = now
+            return 1
+        self.accumulator += now - self._last
+        self._last = now
+
+        steps = int(self.accumulator // self.dt)
+        self.accumulator -= steps * self.dt
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        return steps
@@ -0,0 +1,225 @@
+"""
+Bot-vs-bot tournaments on the headless multiplayer rules.
+
+Every pairing of the given controllers (see :mod:`src.bots`) plays ``rounds`` matches,
+alternating sides. Matches are spread over a process pool; each match gets its own
+seed derived from the tournament seed and its match id, and seeds both the food RNG
+and the ``random`` module of the worker, so any single match can be replayed.
+
+Finished matches are appended to a JSON Lines file as soon as they complete. Its first
+line records the tournament's settings. Running the same command again skips every
+match already in that file, so an interrupted tournament resumes where it stopped; a
+file written with other settings is refused instead of mixed into the results.
+
+Run from the repository root:
+
+    python -m src.tournament src.bots:greedy_bot src.bots:random_bot --rounds 500
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from src.bots import load_controller
+from src.engine import START_LENGTH, GameState, new_multiplayer_state, step
+
+DEFAULT_WIDTH = 80
+DEFAULT_HEIGHT = 75
+DEFAULT_MAX_TICKS = 20000
+
+# (match id, controller path for snake 0, controller path for snake 1, seed)
+MatchSpec = Tuple[int, str, str, int]
+
+
+def match_seed(tournament_seed: int, match_id: int) -> int:
+    return random.Random(f"{tournament_seed}:{match_id}").getrandbits(63)
+
+
+def schedule(controllers: Sequence[str], rounds: int, seed: int) -> Iterator[MatchSpec]:
+    """All matches of a tournament in a fixed order, so match ids are stable across runs."""
+    match_id = 0
+    for a, b in itertools.combinations(controllers, 2):
+        for round_index in range(rounds):
+            first, second = (a, b) if round_index % 2 == 0 else (b, a)
+            yield match_id, first, second, match_seed(seed, match_id)
+            match_id += 1
+
+
+def _winner(state: GameState) -> Optional[int]:
+    """Winner of a match: the stronger snake of a head-on collision, or the last one alive."""
+    if state.winner is not None:
+        return state.winner
+    alive = [i for i, snake in enumerate(state.snakes) if snake.alive]
+    return alive[0] if len(alive) == 1 else None
+
+
+def play_match(spec: MatchSpec, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+               max_ticks: int = DEFAULT_MAX_TICKS) -> dict:
+    """
+    Plays one match and returns its result.
+
+    The match ends when at most one snake is left or after ``max_ticks`` (a tie).
+    """
+    match_id, first, second, seed = spec
+    controllers = [load_controller(first), load_controller(second)]
+    random.seed(seed)
+    state = new_multiplayer_state(width, height, seed)
+    start = time.perf_counter()
+    while not state.game_over and state.tick < max_ticks and sum(s.alive for s in state.snakes) > 1:
+        actions = [controller(state, i) if state.snakes[i].alive else None
+                   for i, controller in enumerate(controllers)]
+        step(state, actions)
+    winner = _winner(state)
+    return {
+        "match": match_id,
+        "players": [first, second],
+        "seed": seed,
+        "winner": None if winner is None else [first, second][winner],
+        "ticks": state.tick,
+        "lengths": [START_LENGTH + snake.score for snake in state.snakes],
+        "duration": time.perf_counter() - start,
+    }
+
+
+def _play_chunk(specs: List[MatchSpec], width: int, height: int, max_ticks: int) -> List[dict]:
+    return [play_match(spec, width, height, max_ticks) for spec in specs]
+
+
+def tournament_header(controllers: Sequence[str], rounds: int, seed: int, width: int, height: int,
+                      max_ticks: int) -> dict:
+    """First line of a results file: everything that decides which matches are played and how."""
+    return {"tournament": {"controllers": list(controllers), "rounds": rounds, "seed": seed,
+                           "width": width, "height": height, "max_ticks": max_ticks}}
+
+
+def load_results(path: str) -> Tuple[Optional[dict], List[dict]]:
+    """
+    Header and results already stored in ``path`` (None and [] if there is no file); a
+    line cut off by an interruption is ignored.
+    """
+    if not os.path.exists(path):
+        return None, []
+    header = None
+    results = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if "tournament" in entry:
+                header = header or entry
+            else:
+                results.append(entry)
+    return header, results
+
+
+def run_tournament(controllers: Sequence[str], rounds: int, results_path: str, seed: int = 0,
+                   workers: Optional[int] = None, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                   max_ticks: int = DEFAULT_MAX_TICKS, chunk_size: int = 16) -> List[dict]:
+    """
+    Plays every missing match of the tournament and returns all results, old and new.
+
+    Matches are sent to the workers in chunks of ``chunk_size`` to keep the per-task
+    overhead small; each finished chunk is written to ``results_path`` right away.
+
+    :raises ValueError: if ``results_path`` holds results of a tournament with other settings
+    """
+    for path in controllers:
+        load_controller(path)  # fail early on typos instead of in every worker
+
+    header = tournament_header(controllers, rounds, seed, width, height, max_ticks)
+    stored_header, results = load_results(results_path)
+    if (stored_header or results) and stored_header != header:
+        raise ValueError(f"{results_path} holds results of a tournament with other settings "
+                         f"({stored_header and stored_header['tournament']}); use another --results file")
+    done: Set[int] = {result["match"] for result in results}
+    pending = [spec for spec in schedule(controllers, rounds, seed) if spec[0] not in done]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    with open(results_path, "a+", encoding="utf-8") as file, ProcessPoolExecutor(workers) as pool:
+        if file.tell() > 0:
+            file.seek(file.tell() - 1)
+            if file.read(1) != "\n":
+                file.write("\n")  # start after a line cut off by an interruption
+        if stored_header is None:
+            file.write(json.dumps(header) + "\n")
+        futures = [pool.submit(_play_chunk, chunk, width, height, max_ticks) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                file.write(json.dumps(result) + "\n")
+                results.append(result)
+            file.flush()
+            print(f"\r{len(results)}/{len(done) + len(pending)} matches", end="", flush=True)
+        if futures:
+            print()
+    return results
+
+
+def aggregate(results: Sequence[dict]) -> Dict[str, dict]:
+    """Per controller: matches, wins, ties, losses, rates, average final length and match duration."""
+    stats: Dict[str, dict] = {}
+    for result in results:
+        for side, player in enumerate(result["players"]):
+            entry = stats.setdefault(player, {"matches": 0, "wins": 0, "ties": 0, "losses": 0,
+                                              "length": 0, "ticks": 0, "duration": 0.0})
+            entry["matches"] += 1
+            if result["winner"] is None:
+                entry["ties"] += 1
+            elif result["winner"] == player:
+                entry["wins"] += 1
+            else:
+                entry["losses"] += 1
+            entry["length"] += result["lengths"][side]
+            entry["ticks"] += result["ticks"]
+            entry["duration"] += result["duration"]
+
+    summary = {}
+    for player, entry in stats.items():
+        matches = entry["matches"]
+        summary[player] = {
+            "matches": matches,
+            "wins": entry["wins"],
+            "ties": entry["ties"],
+            "losses": entry["losses"],
+            "win_rate": entry["wins"] / matches,
+            "tie_rate": entry["ties"] / matches,
+            "avg_length": entry["length"] / matches,
+            "avg_ticks": entry["ticks"] / matches,
+            "avg_duration": entry["duration"] / matches,
+        }
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bot-vs-bot tournament on the multiplayer rules")
+    parser.add_argument("controllers", nargs="+", help="controller paths like src.bots:greedy_bot")
+    parser.add_argument("--rounds", type=int, default=100, help="matches per pairing")
+    parser.add_argument("--results", default="tournament.jsonl", help="JSON Lines file, resumed if it exists")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS)
+    args = parser.parse_args(argv)
+    if len(args.controllers) < 2:
+        parser.error("a tournament needs at least two controllers")
+
+    try:
+        results = run_tournament(args.controllers, args.rounds, args.results, args.seed, args.workers,
+                                 args.width, args.height, args.max_ticks)
+    except ValueError as err:
+        parser.error(str(err))
+    summary = aggregate(results)
+    print(f"{'controller':<30} {'matches':>8} {'win':>7} {'tie':>7} {'length':>8} {'ticks':>8} {'ms':>8}")
+    for player, entry in sorted(summary.items(), key=lambda item: -item[1]["win_rate"]):
+        print(f"{player:<30} {entry['matches']:>8} {entry['win_rate']:>7.1%} {entry['tie_rate']:>7.1%} "
+              f"{entry['avg_length']:>8.1f} {entry['avg_ticks']:>8.0f} {entry['avg_duration'] * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
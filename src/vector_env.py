@@ -0,0 +1,253 @@
+"""
+Batched simulator that advances many independent boards per call, for training bots.
+
+The rules are the ones of :func:`src.engine.step`, applied to NumPy arrays with
+one row per environment instead of Python objects: the occupancy grid uses the
+same EMPTY/FOOD/owner encoding, snake bodies are ring buffers of packed cells, and
+every phase of a tick (turn, move, self collisions, snake-vs-snake, head placement,
+food) runs in the same order as in the engine. Only the food RNG differs, so food
+positions are not the same as in an engine game with the same seed.
+
+Usage follows the Gym vector-env convention::
+
+    env = VectorSnakeEnv(1024, mode=MODE_MULTIPLAYER, seed=0)
+    obs = env.reset()
+    obs, rewards, dones, info = env.step(actions)  # actions: (num_envs, num_snakes)
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.engine import EMPTY, FOOD, MULTIPLAYER_OFFSET, START_LENGTH
+from src.replay import DIRECTION_CODES, MODE_MULTIPLAYER, MODE_SINGLEPLAYER
+
+NO_ACTION = -1
+
+_CODES = [DIRECTION_CODES[name] for name in ("UP", "DOWN", "LEFT", "RIGHT")]
+_DX = np.zeros(4, np.int64)
+_DY = np.zeros(4, np.int64)
+_DY[_CODES[0]], _DY[_CODES[1]], _DX[_CODES[2]], _DX[_CODES[3]] = -1, 1, -1, 1
+_OPPOSITE = np.zeros(4, np.int8)
+_OPPOSITE[_CODES] = [_CODES[1], _CODES[0], _CODES[3], _CODES[2]]
+_RIGHT = DIRECTION_CODES["RIGHT"]
+
+# (snakes, wrap, food items) as in new_singleplayer_state / new_multiplayer_state
+MODES = {
+    MODE_SINGLEPLAYER: (1, False, 1),
+    MODE_MULTIPLAYER: (2, True, 2),
+}
+
+
+class VectorSnakeEnv:
+    """
+    ``num_envs`` independent boards of ``width`` x ``height`` cells.
+
+    Actions are direction codes (``DIRECTION_CODES``) or NO_ACTION, one per snake.
+    Observations are uint8 tensors of shape (num_envs, 1 + 2 * num_snakes, height, width):
+    channel 0 is food, then one body plane per snake, then one head plane per snake. Rewards are +1 per food item and
+    -1 when a snake dies. With ``autoreset`` finished boards start over at the end of
+    ``step``; their final scores, winner and length are reported in ``info``.
+    """
+
+    def __init__(self, num_envs: int, width: int = 80, height: int = 80, mode: int = MODE_SINGLEPLAYER,
+                 seed: Optional[int] = None, autoreset: bool = True):
+        if mode not in MODES:
+            raise ValueError(f"Unknown game mode {mode}")
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.num_snakes, self.wrap, self.num_food = MODES[mode]
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+
+        n, s = num_envs, self.num_snakes
+        self.grid = np.zeros((n, self.size), np.uint8)
+        self.body = np.zeros((n, s, self.size), np.int64)  # ring buffer, head at head_ptr
+        self.head_ptr = np.zeros((n, s), np.int64)
+        self.length = np.zeros((n, s), np.int64)
+        self.direction = np.full((n, s), _RIGHT, np.int8)
+        self.alive = np.zeros((n, s), bool)
+        self.score = np.zeros((n, s), np.int64)
+        self.food = np.full((n, self.num_food), -1, np.int64)
+        self.done = np.zeros(n, bool)
+        self.winner = np.full(n, -1, np.int64)  # index of the winning snake, -1 for none or a tie
+        self.board_full = np.zeros(n, bool)
+        self.ticks = np.zeros(n, np.int64)
+        self._plane_values = np.array([FOOD] + list(range(1, s + 1)), np.uint8)[None, :, None]
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Puts all boards into their start position and returns the observation.
+        With ``mask`` only the selected boards are reset and nothing is returned.
+        """
+        envs = np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+        center_x, center_y = self.width // 2, self.height // 2
+        self.grid[envs] = EMPTY
+        for k in range(self.num_snakes):
+            cells = center_y * self.width + center_x + k * MULTIPLAYER_OFFSET - np.arange(START_LENGTH)
+            self.body[envs, k, :START_LENGTH] = cells
+            self.grid[envs[:, None], cells] = k + 1
+        self.head_ptr[envs] = 0
+        self.length[envs] = START_LENGTH
+        self.direction[envs] = _RIGHT
+        self.alive[envs] = True
+        self.score[envs] = 0
+        self.food[envs] = -1
+        self.done[envs] = False
+        self.winner[envs] = -1
+        self.ticks[envs] = 0
+        self._spawn_food(envs)
+        return self.observe() if mask is None else None
+
+    def heads(self) -> np.ndarray:
+        """Packed head cell per (env, snake); meaningless for dead snakes."""
+        envs = np.arange(self.num_envs)[:, None]
+        snakes = np.arange(self.num_snakes)[None, :]
+        return self.body[envs, snakes, self.head_ptr]
+
+    def observe(self) -> np.ndarray:
+        s = self.num_snakes
+        obs = np.empty((self.num_envs, 1 + 2 * s, self.size), bool)
+        np.equal(self.grid[:, None, :], self._plane_values, out=obs[:, :1 + s])
+        obs[:, 1 + s:] = False
+        heads = self.heads()
+        for k in range(s):
+            live = np.flatnonzero(self.alive[:, k])
+            obs[live, 1 + s + k, heads[live, k]] = True
+        return obs.view(np.uint8).reshape(self.num_envs, -1, self.height, self.width)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """Advances every running board by one tick."""
+        n, s = self.num_envs, self.num_snakes
+        actions = np.asarray(actions).reshape(n, s)
+        active = ~self.done
+        rewards = np.zeros((n, s), np.float32)
+        self.ticks[active] += 1
+
+        # Turn (reversals are ignored)
+        live = self.alive & active[:, None]
+        turn = live & (actions >= 0) & (actions != _OPPOSITE[self.direction])
+        self.direction = np.where(turn, actions, self.direction).astype(np.int8)
+
+        # Move one snake after the other, heads are not written into the grid yet
+        heads = np.full((n, s), -1, np.int64)
+        for k in range(s):
+            envs = np.flatnonzero(live[:, k])
+            if not envs.size:
+                continue
+            y, x = np.divmod(self.body[envs, k, self.head_ptr[envs, k]], self.width)
+            direction = self.direction[envs, k]
+            x = x + _DX[direction]
+            y = y + _DY[direction]
+            if self.wrap:
+                x %= self.width
+                y %= self.height
+            else:
+                inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+                self._kill(envs[~inside], k, rewards)
+                envs, x, y = envs[inside], x[inside], y[inside]
+            new_head = y * self.width + x
+
+            eat = self.grid[envs, new_head] == FOOD
+            eaters, eaten = envs[eat], new_head[eat]
+            self.score[eaters, k] += 1
+            rewards[eaters, k] += 1
+            self.grid[eaters, eaten] = EMPTY
+            self.food[eaters] = np.where(self.food[eaters] == eaten[:, None], -1, self.food[eaters])
+
+            movers = envs[~eat]
+            tail_ptr = (self.head_ptr[movers, k] + self.length[movers, k] - 1) % self.size
+            self.grid[movers, self.body[movers, k, tail_ptr]] = EMPTY
+            self.length[movers, k] -= 1
+
+            head_ptr = (self.head_ptr[envs, k] - 1) % self.size
+            self.head_ptr[envs, k] = head_ptr
+            self.body[envs, k, head_ptr] = new_head
+            self.length[envs, k] += 1
+            heads[envs, k] = new_head
+
+        # Self collisions
+        for k in range(s):
+            envs = np.flatnonzero(self.alive[:, k] & active)
+            self._kill(envs[self.grid[envs, heads[envs, k]] == k + 1], k, rewards)
+
+        if s > 1:
+            self._resolve_snake_collisions(heads, active, rewards)
+
+        # Place the new heads
+        for k in range(s):
+            envs = np.flatnonzero(self.alive[:, k] & active)
+            self.grid[envs, heads[envs, k]] = k + 1
+
+        self.done |= active & ~self.alive.any(axis=1)
+        self._spawn_food(np.flatnonzero(active & ~self.done))
+
+        info = {"done": self.done.copy(), "score": self.score.copy(), "winner": self.winner.copy(),
+                "length": self.length.copy(), "ticks": self.ticks.copy()}
+        dones = self.done.copy()
+        if self.autoreset and dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones, info
+
+    def _resolve_snake_collisions(self, heads: np.ndarray, active: np.ndarray, rewards: np.ndarray) -> None:
+        """First head-into-snake collision per board, found in the same order as the engine."""
+        n, s = self.num_envs, self.num_snakes
+        found = np.zeros(n, bool)
+        first = np.full(n, -1, np.int64)
+        second = np.full(n, -1, np.int64)
+        for k in range(s):
+            envs = np.flatnonzero(self.alive[:, k] & active & ~found)
+            owner = self.grid[envs, heads[envs, k]].astype(np.int64)
+            hit = (owner != EMPTY) & (owner != FOOD) & (owner != k + 1)
+            found[envs[hit]] = True
+            first[envs[hit]] = k
+            second[envs[hit]] = owner[hit] - 1
+            rest = envs[~hit]
+            for t in range(k):
+                same = rest[self.alive[rest, t] & (heads[rest, t] == heads[rest, k]) & ~found[rest]]
+                found[same] = True
+                first[same] = t
+                second[same] = k
+
+        envs = np.flatnonzero(found)
+        if not envs.size:
+            return
+        first, second = first[envs], second[envs]
+        first_length = self.length[envs, first]
+        second_length = self.length[envs, second]
+        first_wins = first_length > second_length
+        second_wins = second_length > first_length
+        self.winner[envs] = np.where(first_wins, first, np.where(second_wins, second, -1))
+        for k in range(s):
+            self._kill(envs[(first == k) & ~first_wins], k, rewards)
+            self._kill(envs[(second == k) & ~second_wins], k, rewards)
+        self.done[envs] = True
+
+    def _kill(self, envs: np.ndarray, k: int, rewards: np.ndarray) -> None:
+        if not envs.size:
+            return
+        grid = self.grid[envs]
+        grid[grid == k + 1] = EMPTY
+        self.grid[envs] = grid
+        self.alive[envs, k] = False
+        self.length[envs, k] = 0
+        rewards[envs, k] -= 1
+
+    def _spawn_food(self, envs: np.ndarray) -> None:
+        """Fills empty food slots with uniformly chosen free cells."""
+        self.board_full[envs] = False
+        for slot in range(self.num_food):
+            needy = envs[self.food[envs, slot] < 0]
+            needy = needy[~self.board_full[needy]]
+            if not needy.size:
+                continue
+            free = self.grid[needy] == EMPTY
+            keys = self.rng.random(free.shape)
+            keys[~free] = -1.0
+            cells = keys.argmax(axis=1)
+            ok = free[np.arange(needy.size), cells]
+            self.board_full[needy[~ok]] = True
+            self.food[needy[ok], slot] = cells[ok]
+            self.grid[needy[ok], cells[ok]] = FOOD
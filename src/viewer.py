@@ -0,0 +1,89 @@
+import pygame
+import sys
+from typing import List
+from src.spectator import FeedClient
+from src.logic import BaseLogic, COLORS, FONT_NAME, FONT_SIZE_SCORE
+from src.multiplayer import PlayerScoreBar
+from src.fonts import get_font, render_text
+
+
+class ViewerLogic(PlayerScoreBar, BaseLogic):
+    def __init__(self, game_window: pygame.Surface, fps_controller: pygame.time.Clock, window_width: int, window_height: int,
+                 host: str, port: int):
+        """
+        Watches the games of a spectator feed (``main.py --spectate``) without playing.
+
+        The game is simulated by the host only; this class draws its copy of the state,
+        which the client keeps up to date from the feed. After a game ends the result
+        stays on screen until the host starts the next one, so it can run as a lobby screen.
+        """
+        super().__init__(game_window, fps_controller, window_width, window_height)
+        self.client = FeedClient(host, port)
+        self.player_names: List[str] = []
+        self._result_shown = False
+
+    @property
+    def score(self) -> int:
+        return 0
+
+    @property
+    def game_over_flag(self) -> bool:
+        return not self.client.connected
+
+    def process_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.client.close()
+                pygame.quit()
+                sys.exit()
+        self.client.poll()
+        if self.state is not self.client.state:
+            self.state = self.client.state
+            self.player_names = self.client.names
+            self.board_width, self.board_height = self.state.width, self.state.height
+            self.full_redraw = True
+            self._result_shown = False
+
+    def update(self) -> None:
+        """The host advances the game; its ticks are applied in :meth:`process_events`."""
+
+    def _draw_message(self, message: str) -> pygame.Rect:
+        """Draws ``message`` on a black box in the middle of the window and returns the box."""
+        font = get_font(FONT_NAME, FONT_SIZE_SCORE)
+        text = render_text(font, message, COLORS["WHITE"])
+        rect = text.get_rect(center=(self.window_width // 2, self.window_height // 2))
+        box = rect.inflate(20, 10)
+        pygame.draw.rect(self.game_window, COLORS["BLACK"], box)
+        self.game_window.blit(text, rect)
+        return box
+
+    def draw_elements(self, colors=None) -> None:
+        if self.state is None:
+            self.game_window.fill(COLORS["BLACK"])
+            self._draw_message("Waiting for a game...")
+            pygame.display.flip()
+            return
+        super().draw_elements(colors)
+        if self.client.game_over and not self._result_shown:
+            # shown once; the board does not change again until the next game replaces it
+            winner = self.client.winner
+            pygame.display.update(self._draw_message(
+                "Game Over! (Tie)" if winner is None else f"Winner: {self.player_names[winner]}"))
+            self._result_shown = True
+
+    def game_over(self) -> int:
+        """The feed closed: says so and waits for a key."""
+        self.client.close()
+        font = get_font(FONT_NAME, FONT_SIZE_SCORE * 2)
+        text = render_text(font, "Connection lost", COLORS["WHITE"])
+        self.game_window.fill(COLORS["BLACK"])
+        self.game_window.blit(text, text.get_rect(center=(self.window_width // 2, self.window_height // 2)))
+        pygame.display.flip()
+
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    return 0
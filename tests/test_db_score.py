@@ -0,0 +1,113 @@
+import json
+
+import psycopg2
+import pytest
+
+from src import db_score
+from src.db_score import STATUS_READY, STATUS_UNAVAILABLE, DBScore
+
+
+class FakeCursor:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        if self.fail and "schema_version" in query:
+            raise psycopg2.OperationalError("permission denied for schema public")
+
+    def fetchone(self):
+        return (len(db_score.MIGRATIONS),)
+
+
+class FakeConnection:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def cursor(self):
+        return FakeCursor(self.fail)
+
+
+class FakePool:
+    """Ersetzt ThreadedConnectionPool; ``fail`` lässt die Schema-Migration fehlschlagen."""
+    fail = False
+    created = []
+
+    def __init__(self, **kwargs):
+        self.closed = False
+        self.created.append(self)
+
+    def getconn(self):
+        return FakeConnection(self.fail)
+
+    def putconn(self, conn):
+        pass
+
+    def closeall(self):
+        self.closed = True
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({
+        "DB_HOST": "localhost", "DB_USER": "snake", "DB_PASSWORD": "snake", "DB_NAME": "snake",
+        "DB_PORT": "5432", "DB_SSLMODE": "disable", "DB_CONNECT_TIMEOUT": 1,
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    FakePool.created = []
+    monkeypatch.setattr(psycopg2.pool, "ThreadedConnectionPool", FakePool)
+    return FakePool
+
+
+def connect(config_path: str) -> DBScore:
+    store = DBScore(config_path)
+    assert store._attempt_done.wait(5)
+    return store
+
+
+def test_failed_migration_keeps_store_unavailable(config_path, fake_pool, monkeypatch):
+    monkeypatch.setattr(fake_pool, "fail", True)
+    store = connect(config_path)
+
+    assert store.status == STATUS_UNAVAILABLE
+    assert not store.is_available
+    assert store.connection_pool is None
+    assert fake_pool.created[0].closed
+    assert store.get_top_scores() == []
+    assert store.insert_scores([("Anna", 3, None)]) is False
+
+
+def test_failed_migration_is_retried_after_reconnect_interval(config_path, fake_pool, monkeypatch):
+    monkeypatch.setattr(fake_pool, "fail", True)
+    store = connect(config_path)
+    assert store.status == STATUS_UNAVAILABLE
+
+    monkeypatch.setattr(fake_pool, "fail", False)
+    monkeypatch.setattr(db_score, "RECONNECT_INTERVAL", -1)
+    assert store._get_connection() is not None
+    assert store.status == STATUS_READY
+    assert len(fake_pool.created) == 2
+
+
+def test_successful_migration_makes_store_ready(config_path, fake_pool):
+    store = connect(config_path)
+
+    assert store.status == STATUS_READY
+    assert store.connection_pool is fake_pool.created[0]
+    assert not fake_pool.created[0].closed
@@ -0,0 +1,46 @@
+import random
+
+from src.bots import greedy_bot, random_bot
+from src.engine import GameState, step
+from src.replay import MODE_PARTY, MODE_SINGLEPLAYER, Replay, play
+
+
+def snapshot(state: GameState) -> tuple:
+    snakes = tuple((tuple(snake.body), snake.direction, snake.alive, snake.score) for snake in state.snakes)
+    return snakes, tuple(state.food), bytes(state.grid), state.game_over, state.winner
+
+
+def record_game(replay: Replay, bot, max_ticks: int = 3000) -> GameState:
+    """Plays ``replay``'s game with ``bot`` steering every snake, recording each tick."""
+    random.seed(1)
+    state = replay.new_state()
+    while not state.game_over and replay.ticks < max_ticks:
+        actions = [bot(state, index) if snake.alive else None for index, snake in enumerate(state.snakes)]
+        replay.record(state, actions)
+        step(state, actions)
+    return state
+
+
+def test_round_trip_plays_back_the_recorded_game():
+    for replay, bot in ((Replay(MODE_SINGLEPLAYER, 40, 30, seed=7), greedy_bot),
+                        (Replay(MODE_PARTY, 60, 60, seed=11, players=6), random_bot)):
+        live = record_game(replay, bot)
+        loaded = Replay.from_bytes(replay.to_bytes())
+
+        assert loaded.events == replay.events
+        assert loaded.ticks == replay.ticks
+        assert snapshot(play(loaded)) == snapshot(live)
+
+
+def test_turns_into_the_current_direction_are_not_recorded():
+    replay = Replay(MODE_SINGLEPLAYER, 40, 30, seed=7)
+    state = replay.new_state()
+    direction = state.snakes[0].direction
+    turn = "UP" if direction in ("LEFT", "RIGHT") else "LEFT"
+
+    for action in (direction, None, turn, turn, direction):
+        replay.record(state, [action])
+        step(state, [action])
+
+    assert replay.events == [(3, 0, turn), (5, 0, direction)]
+    assert replay.ticks == 5